@@ -21,6 +21,10 @@ class ServerConfig:
     PORT: int = int(os.getenv("MCP_PORT", "8020"))
     DEBUG: bool = os.getenv("MCP_DEBUG", "False").lower() == "true"
     
+    # 工作进程数；大于 1 时由 uvicorn 在每个进程中通过 create_app 工厂构建应用。
+    # 注意 SSE 会话保存在进程内存中，多进程部署需要负载均衡器保持会话粘性
+    WORKERS: int = int(os.getenv("MCP_WORKERS", "1"))
+    
     # 协议设置
     PROTOCOL_VERSION: str = "1.0"
     
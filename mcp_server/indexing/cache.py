@@ -11,6 +11,11 @@ from typing import Dict, Any, Optional, Set, List
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 from ..config import config
 from ..utils import calculate_file_hash, get_current_timestamp
 
@@ -33,10 +38,17 @@ class FileIndexCache:
             cache_dir: 缓存目录（如果为 None 则使用配置默认值）
         """
         self.cache_dir = cache_dir or os.path.join(config.index.INDEX_DIR, "cache")
-        self.cache_file = os.path.join(self.cache_dir, "file_index_cache.json")
+        # 安装了 msgpack 时使用二进制格式，加载/保存比 JSON 更快、更小
+        self.json_cache_file = os.path.join(self.cache_dir, "file_index_cache.json")
+        if msgpack is not None:
+            self.cache_file = os.path.join(self.cache_dir, "file_index_cache.msgpack")
+        else:
+            self.cache_file = self.json_cache_file
         
         # 缓存数据结构
         self.cache_data: Dict[str, Dict[str, Any]] = {}
+        # 内容哈希 -> 规范化路径 的二级索引
+        self._hash_index: Dict[str, str] = {}
         
         # 缓存配置
         self.cache_ttl = int(os.getenv("MCP_CACHE_TTL", str(24 * 3600)))  # 24小时默认TTL
@@ -184,7 +196,9 @@ class FileIndexCache:
                 ]
             
             # 存储到缓存
+            self._remove_from_cache(normalized_path)
             self.cache_data[normalized_path] = cache_entry
+            self._hash_index[file_hash] = normalized_path
             
             # 清理过期和过多的缓存条目
             self._cleanup_cache()
@@ -210,6 +224,32 @@ class FileIndexCache:
         normalized_path = os.path.normpath(os.path.abspath(file_path))
         return self.cache_data.get(normalized_path)
     
+    def get_cached_by_content_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        按文件内容哈希获取缓存信息。
+        
+        用于命中重命名或重新下载（修改时间已变化）但内容相同的文件。
+        
+        参数:
+            content_hash: 文件内容哈希（与 calculate_file_hash 结果一致）
+            
+        返回:
+            缓存信息字典，如果未缓存或已过期则返回 None
+        """
+        cached_path = self._hash_index.get(content_hash)
+        if cached_path is None:
+            return None
+        
+        cache_entry = self.cache_data.get(cached_path)
+        if cache_entry is None or cache_entry.get("file_hash") != content_hash:
+            self._hash_index.pop(content_hash, None)
+            return None
+        
+        if self._is_cache_expired(cache_entry):
+            return None
+        
+        return cache_entry
+    
     def invalidate_file_cache(self, file_path: str) -> None:
         """
         使特定文件的缓存失效。
@@ -225,6 +265,7 @@ class FileIndexCache:
     def invalidate_all_cache(self) -> None:
         """使所有缓存失效。"""
         self.cache_data.clear()
+        self._hash_index.clear()
         self._save_cache()
         logger.info("所有文件缓存已失效")
     
@@ -314,11 +355,19 @@ class FileIndexCache:
     def _load_cache(self) -> None:
         """从磁盘加载缓存数据。"""
         try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
+            if msgpack is not None and os.path.exists(self.cache_file):
+                with open(self.cache_file, 'rb') as f:
+                    data = msgpack.unpackb(f.read(), raw=False)
+            elif os.path.exists(self.json_cache_file):
+                # JSON 格式（未安装 msgpack，或从旧版缓存迁移）
+                with open(self.json_cache_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                    self.cache_data = data.get("cache_entries", {})
-                    
+            else:
+                data = None
+            
+            if data is not None:
+                self.cache_data = data.get("cache_entries", {})
+                self._rebuild_hash_index()
                 logger.info(f"加载了 {len(self.cache_data)} 个缓存条目")
             else:
                 self.cache_data = {}
@@ -326,6 +375,15 @@ class FileIndexCache:
         except Exception as e:
             logger.warning(f"加载缓存失败: {str(e)}")
             self.cache_data = {}
+            self._hash_index = {}
+    
+    def _rebuild_hash_index(self) -> None:
+        """根据缓存条目重建内容哈希索引。"""
+        self._hash_index = {
+            entry["file_hash"]: file_path
+            for file_path, entry in self.cache_data.items()
+            if entry.get("file_hash")
+        }
     
     def _save_cache(self) -> None:
         """将缓存数据保存到磁盘。"""
@@ -341,8 +399,12 @@ class FileIndexCache:
             
             # 原子写入
             temp_file = self.cache_file + ".tmp"
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_metadata, f, indent=2, ensure_ascii=False)
+            if msgpack is not None:
+                with open(temp_file, 'wb') as f:
+                    f.write(msgpack.packb(cache_metadata, use_bin_type=True))
+            else:
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(cache_metadata, f, indent=2, ensure_ascii=False)
             
             # 原子替换
             if os.path.exists(self.cache_file):
@@ -364,8 +426,11 @@ class FileIndexCache:
     
     def _remove_from_cache(self, file_path: str) -> None:
         """从缓存中移除文件。"""
-        if file_path in self.cache_data:
-            del self.cache_data[file_path]
+        cache_entry = self.cache_data.pop(file_path, None)
+        if cache_entry is not None:
+            file_hash = cache_entry.get("file_hash")
+            if file_hash and self._hash_index.get(file_hash) == file_path:
+                del self._hash_index[file_hash]
     
     def _cleanup_cache(self) -> None:
         """清理缓存以保持在最大条目限制内。"""
@@ -383,6 +448,7 @@ class FileIndexCache:
         
         # 重建缓存数据
         self.cache_data = dict(entries_to_keep)
+        self._rebuild_hash_index()
         
         removed_count = len(sorted_entries) - len(entries_to_keep)
         if removed_count > 0:
@@ -5,20 +5,171 @@ MCP 服务器 PDF 文档解析器
 """
 
 import os
+import mmap
+import atexit
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
 try:
     import fitz  # PyMuPDF
 except ImportError:
     fitz = None
 
-from ..types import ParseResult, FileType, ParserStatus
+from ..types import ParseResult, FileType, ParserStatus, PageInfo
 from ..exceptions import ParsingError, EmptyDocumentError
+from ..utils import calculate_file_hash, get_process_pool_context
 from .base import StructuredParser
 
 logger = logging.getLogger(__name__)
 
+# 提取图像时用于异步写盘的线程数
+IMAGE_WRITER_WORKERS = 4
+
+# 超过该大小的 PDF 通过 mmap 打开
+MMAP_THRESHOLD_BYTES = 32 * 1024 * 1024
+
+# 页数达到该值的 PDF 按页段分发到进程池并行提取
+PARALLEL_MIN_PAGES = 200
+
+# 进程池最大工作进程数
+PARALLEL_MAX_WORKERS = min(os.cpu_count() or 1, 4)
+
+# 文本提取标志：与 get_text("text") 的默认标志一致（含未知 Unicode 字符的 CID 回退），
+# 预先取出常量，避免每页重复解析默认值
+_TEXT_FLAGS = fitz.TEXTFLAGS_TEXT if fitz is not None else 0
+
+# 清理页面文本时移除换页符的转换表
+_FF_STRIPPER = str.maketrans({'\x0c': None})
+
+# 支持的 PDF 文件扩展名（供内省使用，热路径直接比较后缀）
+_PDF_EXTENSIONS = frozenset({'.pdf'})
+
+
+def _get_page_text(page: Any, sort: bool = False) -> str:
+    """
+    提取页面纯文本。
+    
+    参数:
+        page: fitz.Page
+        sort: 是否按阅读顺序（从上到下、从左到右）排序文本块；
+            多栏排版需要，但会增加一次布局排序
+    """
+    return page.get_text("text", sort=sort, flags=_TEXT_FLAGS)
+
+
+def _clean_page_text(page_text: str) -> str:
+    """移除页面文本中的换页符并去除首尾空白。"""
+    if '\x0c' in page_text:
+        page_text = page_text.translate(_FF_STRIPPER)
+    return page_text.strip()
+
+
+def _write_file_bytes(path: str, data: bytes) -> None:
+    """将字节数据写入文件（在 I/O 线程池中执行）。"""
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _warm_up_mupdf() -> None:
+    """
+    预热 MuPDF 字体表等延迟初始化的状态。
+    
+    在内存中创建单页文档并写入、提取一次文本，避免首个真实页面承担初始化开销。
+    """
+    if fitz is None:
+        return
+    
+    try:
+        doc = fitz.open()
+        try:
+            page = doc.new_page()
+            page.insert_text((72, 72), "warmup")
+            page.get_text()
+        finally:
+            doc.close()
+    except Exception as e:
+        logger.debug(f"MuPDF 预热失败: {e}")
+
+
+_warm_up_mupdf()
+
+
+# 服务器生命周期内共享的 PDF 提取进程池（首次使用时创建）
+_PDF_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """获取共享进程池，首次调用（或进程池损坏被丢弃后）时创建。"""
+    global _PDF_POOL
+    with _POOL_LOCK:
+        if _PDF_POOL is None:
+            _PDF_POOL = ProcessPoolExecutor(
+                max_workers=PARALLEL_MAX_WORKERS,
+                mp_context=get_process_pool_context(),
+                initializer=_warm_up_mupdf
+            )
+        return _PDF_POOL
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    丢弃已损坏的进程池，下次调用 _get_pool() 时重新创建。
+    
+    只在共享池仍是传入的池时才替换，避免并发调用方丢弃别人刚重建的新池。
+    """
+    global _PDF_POOL
+    with _POOL_LOCK:
+        if _PDF_POOL is pool:
+            _PDF_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _shutdown_pool() -> None:
+    """关闭共享进程池。"""
+    global _PDF_POOL
+    with _POOL_LOCK:
+        if _PDF_POOL is not None:
+            _PDF_POOL.shutdown(wait=False, cancel_futures=True)
+            _PDF_POOL = None
+
+
+atexit.register(_shutdown_pool)
+
+
+def _extract_page_range(
+    file_path: str,
+    start: int,
+    stop: int,
+    sort: bool = False
+) -> List[Tuple[int, str]]:
+    """
+    在工作进程中提取指定页段的非空页面文本。
+    
+    参数:
+        file_path: PDF 文件路径
+        start: 起始页索引（从 0 开始，包含）
+        stop: 结束页索引（不包含）
+        sort: 是否按阅读顺序排序文本块
+        
+    返回:
+        (页码, 清理后的页面文本) 列表，页码从 1 开始
+    """
+    doc = fitz.open(file_path)
+    try:
+        pages = []
+        for page_num in range(start, stop):
+            cleaned_text = _clean_page_text(_get_page_text(doc[page_num], sort))
+            if cleaned_text:
+                pages.append((page_num + 1, cleaned_text))
+        return pages
+    finally:
+        doc.close()
+
 
 class PDFParser(StructuredParser):
     """
@@ -30,7 +181,10 @@ class PDFParser(StructuredParser):
     def __init__(self):
         """初始化 PDF 解析器。"""
         super().__init__(FileType.PDF)
-        self.supported_extensions = ['.pdf']
+        self.supported_extensions = _PDF_EXTENSIONS
+        # 为 True 时沿用 PyMuPDF 默认的 sort=False（按内容流顺序输出文本块）；
+        # 多栏论文等需要规范阅读顺序时设为 False，改为按阅读顺序排序（速度较慢）
+        self.fast_extract = True
     
     def supports_file(self, file_path: str) -> bool:
         """
@@ -42,7 +196,7 @@ class PDFParser(StructuredParser):
         返回:
             如果文件是 PDF 则返回 True，否则返回 False
         """
-        return os.path.splitext(file_path)[1].lower() in self.supported_extensions
+        return os.fspath(file_path)[-4:].lower() == '.pdf'
     
     def parse(self, file_path: str, use_cache: bool = True) -> ParseResult:
         """
@@ -58,35 +212,27 @@ class PDFParser(StructuredParser):
         引发:
             ParsingError: 如果 PDF 解析失败
         """
+        content_hash = None
+        
         # 如果启用缓存且支持缓存，先检查缓存
         if use_cache and self.cache_aware:
             try:
                 from ..indexing.cache import is_file_indexed_and_current, file_index_cache
                 
-                if is_file_indexed_and_current(file_path):
-                    cached_info = file_index_cache.get_cached_file_info(file_path)
+                if file_index_cache.get_cached_file_info(file_path) is not None:
+                    # 路径已有缓存条目：有效性检查自身可能已计算过哈希，不再按内容哈希查找
+                    if is_file_indexed_and_current(file_path):
+                        cached_info = file_index_cache.get_cached_file_info(file_path)
+                        if cached_info and cached_info.get("parse_content"):
+                            logger.info(f"使用PDF解析缓存: {file_path}")
+                            return self._create_cached_result(file_path, cached_info)
+                else:
+                    # 路径没有缓存条目时按内容哈希查找（重命名或重新下载的相同文件）
+                    content_hash = calculate_file_hash(file_path)
+                    cached_info = file_index_cache.get_cached_by_content_hash(content_hash)
                     if cached_info and cached_info.get("parse_content"):
-                        logger.info(f"使用PDF解析缓存: {file_path}")
-                        
-                        # 从缓存构造结果
-                        from ..types import ParserStatus
-                        return ParseResult(
-                            success=True,
-                            file_path=file_path,
-                            file_type=self.file_type,
-                            status=ParserStatus.SUCCESS,
-                            content=cached_info["parse_content"],
-                            chunks=[],  # 空的，因为主要内容来自缓存
-                            metadata={
-                                "from_cache": True,
-                                "cached_at": cached_info.get("indexed_at"),
-                                "file_size": cached_info.get("size", 0),
-                                "chunks_count": cached_info.get("chunks_count", 0),
-                                "parsing_method": "Cached-PyMuPDF",
-                                **(cached_info.get("metadata", {}))
-                            },
-                            parsing_method="Cached-PyMuPDF"
-                        )
+                        logger.info(f"使用PDF内容哈希缓存: {file_path} (来源: {cached_info.get('file_path')})")
+                        return self._create_cached_result(file_path, cached_info)
                         
             except ImportError:
                 logger.debug("缓存模块不可用，执行常规PDF解析")
@@ -94,14 +240,45 @@ class PDFParser(StructuredParser):
                 logger.warning(f"PDF缓存检查失败: {e}，执行常规解析")
         
         # 缓存未命中或禁用缓存，执行常规解析
-        return self._parse_pdf_content(file_path)
+        return self._parse_pdf_content(file_path, content_hash=content_hash)
     
-    def _parse_pdf_content(self, file_path: str) -> ParseResult:
+    def _create_cached_result(self, file_path: str, cached_info: Dict[str, Any]) -> ParseResult:
+        """
+        从缓存信息构造解析结果。
+        
+        参数:
+            file_path: PDF 文件路径
+            cached_info: 缓存条目
+            
+        返回:
+            标记为来自缓存的 ParseResult
+        """
+        return ParseResult(
+            success=True,
+            file_path=file_path,
+            file_type=self.file_type,
+            status=ParserStatus.SUCCESS,
+            content=cached_info["parse_content"],
+            chunks=[],  # 空的，因为主要内容来自缓存
+            metadata={
+                "from_cache": True,
+                "cached_at": cached_info.get("indexed_at"),
+                "file_size": cached_info.get("size", 0),
+                "chunks_count": cached_info.get("chunks_count", 0),
+                "content_hash": cached_info.get("file_hash"),
+                "parsing_method": "Cached-PyMuPDF",
+                **(cached_info.get("metadata", {}))
+            },
+            parsing_method="Cached-PyMuPDF"
+        )
+    
+    def _parse_pdf_content(self, file_path: str, content_hash: Optional[str] = None) -> ParseResult:
         """
         执行PDF内容的实际解析。
         
         参数:
             file_path: PDF 文件路径
+            content_hash: 已计算的文件内容哈希（可选，写入元数据以便按内容查找缓存）
             
         返回:
             包含提取内容和元数据的 ParseResult
@@ -114,8 +291,21 @@ class PDFParser(StructuredParser):
             )
         
         try:
-            # 提取结构化内容
-            structured_content = self.extract_structured_content(file_path)
+            # 只打开一次文档，结构化内容、文档元数据和页数共用同一句柄
+            with self._open_doc(file_path) as doc:
+                page_count = doc.page_count
+                document_metadata = self._clean_metadata(doc.metadata)
+                structured_content = None
+                if page_count >= PARALLEL_MIN_PAGES and PARALLEL_MAX_WORKERS > 1:
+                    pool = _get_pool()
+                    try:
+                        structured_content = self._extract_parallel(pool, file_path, page_count)
+                    except BrokenProcessPool as e:
+                        # 工作进程异常退出（如被 OOM 终止）：丢弃损坏的进程池，本文档改为串行提取
+                        logger.warning(f"PDF 提取进程池已损坏，改为串行提取 {file_path}: {e}")
+                        _discard_pool(pool)
+                if structured_content is None:
+                    structured_content = self._extract_from_doc(doc)
             
             # 合并为完整文本
             full_text = self.combine_structured_content(structured_content)
@@ -126,10 +316,14 @@ class PDFParser(StructuredParser):
             # 创建元数据
             metadata = {
                 "total_pages": structured_content.get("total_pages", 0),
-                "pages": structured_content.get("pages", []),
+                "pages": [page.to_dict() for page in structured_content.get("pages", [])],
+                "page_count": page_count,
+                "document_metadata": document_metadata,
                 "file_size": os.path.getsize(file_path),
                 "parsing_method": "PyMuPDF"
             }
+            if content_hash:
+                metadata["content_hash"] = content_hash
             
             logger.info(f"PDF解析完成: {file_path} ({metadata['total_pages']} 页)")
             
@@ -161,40 +355,167 @@ class PDFParser(StructuredParser):
             ParsingError: 如果提取失败
         """
         try:
+            with self._open_doc(file_path) as doc:
+                return self._extract_from_doc(doc)
+            
+        except Exception as e:
+            raise ParsingError(
+                message=f"从 PDF 提取内容失败: {str(e)}",
+                file_path=file_path
+            )
+    
+    @contextmanager
+    def _open_doc(self, file_path: str) -> Iterator[Any]:
+        """
+        打开 PDF 文档，并在退出上下文时关闭。
+        
+        参数:
+            file_path: PDF 文件路径
+            
+        生成:
+            已打开的 fitz.Document
+        """
+        if os.path.getsize(file_path) <= MMAP_THRESHOLD_BYTES:
             doc = fitz.open(file_path)
-            pages_content = []
-            full_text = ""
+            try:
+                yield doc
+            finally:
+                doc.close()
+            return
+        
+        # 大文件通过内存映射打开，由内核页缓存按需调页而非显式读取
+        with open(file_path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mm)
+        try:
+            doc = fitz.open(stream=view, filetype="pdf")
+            try:
+                yield doc
+            finally:
+                doc.close()
+        finally:
+            try:
+                view.release()
+                mm.close()
+            except BufferError:
+                # 仍有对映射缓冲区的引用时交由垃圾回收释放
+                logger.debug(f"PDF 内存映射延迟释放: {file_path}")
+    
+    def _extract_from_doc(self, doc: Any) -> Dict[str, Any]:
+        """
+        从已打开的 PDF 文档中提取结构化内容。
+        
+        参数:
+            doc: 已打开的 fitz.Document
             
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                page_text = page.get_text()
-                
-                # 清理页面文本
-                cleaned_text = page_text.replace('\x0c', '').strip()
-                
-                if cleaned_text:
-                    page_info = {
-                        "page_number": page_num + 1,
-                        "content": cleaned_text,
-                        "char_count": len(cleaned_text),
-                        "bbox": page.rect  # 页面边界框
-                    }
-                    pages_content.append(page_info)
-                    full_text += cleaned_text + "\n\n"
+        返回:
+            包含结构化 PDF 内容的字典
+        """
+        return self._build_structured_content(self._iter_doc_pages(doc))
+    
+    def _build_structured_content(self, pages: Iterable[Tuple[int, str]]) -> Dict[str, Any]:
+        """
+        由逐页文本构建结构化内容字典。
+        
+        参数:
+            pages: (页码, 清理后的页面文本) 可迭代对象
             
-            doc.close()
+        返回:
+            包含 total_pages、pages 和 full_text 的字典
+        """
+        pages_content: List[PageInfo] = []
+        full_text_parts: List[str] = []
+        
+        for page_number, cleaned_text in pages:
+            pages_content.append(PageInfo(page_number, cleaned_text, len(cleaned_text)))
+            full_text_parts.append(cleaned_text)
+        
+        return {
+            "total_pages": len(pages_content),
+            "pages": pages_content,
+            "full_text": "\n\n".join(full_text_parts)
+        }
+    
+    def _extract_parallel(
+        self,
+        pool: ProcessPoolExecutor,
+        file_path: str,
+        page_count: int
+    ) -> Dict[str, Any]:
+        """
+        将页面按页段分发到共享进程池并行提取结构化内容。
+        
+        参数:
+            pool: 共享进程池
+            file_path: PDF 文件路径
+            page_count: 文档总页数
             
-            return {
-                "total_pages": len(pages_content),
-                "pages": pages_content,
-                "full_text": full_text.strip()
-            }
+        返回:
+            与 _extract_from_doc 结构相同的字典
             
-        except Exception as e:
+        异常:
+            BrokenProcessPool: 工作进程异常退出，由调用方丢弃进程池并回退串行提取
+        """
+        step = -(-page_count // PARALLEL_MAX_WORKERS)  # 向上取整
+        futures = [
+            pool.submit(
+                _extract_page_range,
+                file_path,
+                start,
+                min(start + step, page_count),
+                not self.fast_extract
+            )
+            for start in range(0, page_count, step)
+        ]
+        
+        # 按提交顺序收集，保证页面顺序
+        return self._build_structured_content(
+            page for future in futures for page in future.result()
+        )
+    
+    def iter_pages(self, file_path: str) -> Iterator[Tuple[int, str]]:
+        """
+        逐页流式提取 PDF 文本，不在内存中汇总整个文档。
+        
+        文档在生成器耗尽或被关闭时关闭。
+        
+        参数:
+            file_path: PDF 文件路径
+            
+        生成:
+            (页码, 清理后的页面文本) 元组，页码从 1 开始，跳过空白页
+            
+        引发:
+            ParsingError: 如果 PyMuPDF 未安装
+        """
+        if fitz is None:
             raise ParsingError(
-                message=f"从 PDF 提取内容失败: {str(e)}",
+                message="PyMuPDF (fitz) 未安装",
                 file_path=file_path
             )
+        
+        with self._open_doc(file_path) as doc:
+            yield from self._iter_doc_pages(doc)
+    
+    def _iter_doc_pages(self, doc: Any) -> Iterator[Tuple[int, str]]:
+        """
+        从已打开的 PDF 文档中逐页生成清理后的非空文本。
+        
+        参数:
+            doc: 已打开的 fitz.Document
+            
+        生成:
+            (页码, 清理后的页面文本) 元组
+        """
+        # doc.pages() 生成器一次性建立文档状态，避免逐页索引查找
+        for page_num, page in enumerate(doc.pages()):
+            page_text = _get_page_text(page, sort=not self.fast_extract)
+            
+            # 清理页面文本
+            cleaned_text = _clean_page_text(page_text)
+            
+            if cleaned_text:
+                yield page_num + 1, cleaned_text
     
     def extract_metadata(self, file_path: str) -> Dict[str, Any]:
         """
@@ -210,22 +531,27 @@ class PDFParser(StructuredParser):
             return {}
         
         try:
-            doc = fitz.open(file_path)
-            metadata = doc.metadata
-            doc.close()
-            
-            # 清理元数据并转换为可序列化格式
-            clean_metadata = {}
-            for key, value in metadata.items():
-                if value:  # 仅包含非空值
-                    clean_metadata[key.lower()] = str(value)
-            
-            return clean_metadata
+            with self._open_doc(file_path) as doc:
+                return self._clean_metadata(doc.metadata)
             
         except Exception as e:
             logger.warning(f"从 {file_path} 提取 PDF 元数据失败: {str(e)}")
             return {}
     
+    @staticmethod
+    def _clean_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        清理元数据并转换为可序列化格式。
+        
+        参数:
+            metadata: fitz.Document.metadata
+            
+        返回:
+            仅包含非空值、键为小写的元数据字典
+        """
+        # 仅包含非空值
+        return {key.lower(): str(value) for key, value in (metadata or {}).items() if value}
+    
     def extract_page_text(self, file_path: str, page_number: int) -> str:
         """
         从特定页面提取文本。
@@ -247,23 +573,103 @@ class PDFParser(StructuredParser):
             )
         
         try:
-            doc = fitz.open(file_path)
+            with self._open_doc(file_path) as doc:
+                return self._extract_page_text_from_doc(doc, page_number)
             
-            if page_number < 1 or page_number > len(doc):
-                raise ParsingError(
-                    message=f"页码 {page_number} 超出范围 (1-{len(doc)})",
-                    file_path=file_path
-                )
+        except Exception as e:
+            raise ParsingError(
+                message=f"提取第 {page_number} 页失败: {str(e)}",
+                file_path=file_path
+            )
+    
+    def extract_pages_text(self, file_path: str, page_numbers: Iterable[int]) -> Dict[int, str]:
+        """
+        打开一次文档并提取多个页面的文本。
+        
+        参数:
+            file_path: PDF 文件路径
+            page_numbers: 页码集合 (从 1 开始)
             
-            page = doc[page_number - 1]  # 转换为从 0 开始的索引
-            page_text = page.get_text()
-            doc.close()
+        返回:
+            页码到页面文本内容的字典
             
-            return page_text.replace('\x0c', '').strip()
+        引发:
+            ParsingError: 如果任一页面提取失败
+        """
+        if fitz is None:
+            raise ParsingError(
+                message="PyMuPDF (fitz) 未安装",
+                file_path=file_path
+            )
+        
+        try:
+            with self._open_doc(file_path) as doc:
+                return {
+                    page_number: self._extract_page_text_from_doc(doc, page_number)
+                    for page_number in page_numbers
+                }
             
         except Exception as e:
             raise ParsingError(
-                message=f"提取第 {page_number} 页失败: {str(e)}",
+                message=f"提取页面文本失败: {str(e)}",
+                file_path=file_path
+            )
+    
+    def _extract_page_text_from_doc(self, doc: Any, page_number: int) -> str:
+        """
+        从已打开的 PDF 文档中提取特定页面的文本。
+        
+        参数:
+            doc: 已打开的 fitz.Document
+            page_number: 页码 (从 1 开始)
+            
+        返回:
+            指定页面的文本内容
+            
+        引发:
+            ValueError: 如果页码超出范围
+        """
+        if page_number < 1 or page_number > len(doc):
+            raise ValueError(f"页码 {page_number} 超出范围 (1-{len(doc)})")
+        
+        page = doc[page_number - 1]  # 转换为从 0 开始的索引
+        return _clean_page_text(_get_page_text(page, sort=not self.fast_extract))
+    
+    def get_page_bbox(self, file_path: str, page_number: int) -> Tuple[float, float, float, float]:
+        """
+        获取特定页面的边界框。
+        
+        参数:
+            file_path: PDF 文件路径
+            page_number: 页码 (从 1 开始)
+            
+        返回:
+            页面边界框 (x0, y0, x1, y1)
+            
+        引发:
+            ParsingError: 如果页面不存在或读取失败
+        """
+        if fitz is None:
+            raise ParsingError(
+                message="PyMuPDF (fitz) 未安装",
+                file_path=file_path
+            )
+        
+        try:
+            with self._open_doc(file_path) as doc:
+                if page_number < 1 or page_number > doc.page_count:
+                    raise ParsingError(
+                        message=f"页码 {page_number} 超出范围 (1-{doc.page_count})",
+                        file_path=file_path
+                    )
+                
+                rect = doc[page_number - 1].rect
+            
+            return (rect.x0, rect.y0, rect.x1, rect.y1)
+            
+        except Exception as e:
+            raise ParsingError(
+                message=f"获取第 {page_number} 页边界框失败: {str(e)}",
                 file_path=file_path
             )
     
@@ -287,10 +693,8 @@ class PDFParser(StructuredParser):
             )
         
         try:
-            doc = fitz.open(file_path)
-            page_count = len(doc)
-            doc.close()
-            return page_count
+            with self._open_doc(file_path) as doc:
+                return doc.page_count
             
         except Exception as e:
             raise ParsingError(
@@ -322,33 +726,39 @@ class PDFParser(StructuredParser):
             os.makedirs(output_dir)
         
         extracted_images = []
+        pending_writes = []
         
         try:
-            doc = fitz.open(file_path)
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                image_list = page.get_images()
-                
-                for img_index, img in enumerate(image_list):
-                    # 获取图像数据
-                    xref = img[0]
-                    pix = fitz.Pixmap(doc, xref)
+            # 主线程负责 PNG 编码，磁盘写入交给 I/O 线程池并行完成
+            with self._open_doc(file_path) as doc, \
+                    ThreadPoolExecutor(max_workers=IMAGE_WRITER_WORKERS) as io_pool:
+                for page_num, page in enumerate(doc.pages()):
+                    image_list = page.get_images()
                     
-                    # 跳过 CMYK 图像 (PIL 不支持)
-                    if pix.n - pix.alpha < 4:
-                        if output_dir:
-                            img_name = f"page_{page_num + 1}_img_{img_index + 1}.png"
-                            img_path = os.path.join(output_dir, img_name)
-                            pix.save(img_path)
-                            extracted_images.append(img_path)
-                        else:
-                            # 如果没有输出目录，则只计算图像
-                            extracted_images.append(f"page_{page_num + 1}_img_{img_index + 1}")
-                    
-                    pix = None  # 释放内存
+                    for img_index, img in enumerate(image_list):
+                        # 获取图像数据
+                        xref = img[0]
+                        pix = fitz.Pixmap(doc, xref)
+                        
+                        # 跳过 CMYK 图像 (PIL 不支持)
+                        if pix.n - pix.alpha < 4:
+                            if output_dir:
+                                img_name = f"page_{page_num + 1}_img_{img_index + 1}.png"
+                                img_path = os.path.join(output_dir, img_name)
+                                data = pix.tobytes("png")
+                                pix = None  # 编码完成后立即释放像素缓冲区
+                                pending_writes.append(io_pool.submit(_write_file_bytes, img_path, data))
+                                extracted_images.append(img_path)
+                            else:
+                                # 如果没有输出目录，则只计算图像
+                                extracted_images.append(f"page_{page_num + 1}_img_{img_index + 1}")
+                        
+                        pix = None  # 释放内存
+                
+                # 等待所有写入完成，并传播写入错误
+                for future in pending_writes:
+                    future.result()
             
-            doc.close()
             return extracted_images
             
         except Exception as e:
@@ -371,17 +781,14 @@ class PDFParser(StructuredParser):
             return False
         
         try:
-            doc = fitz.open(file_path)
+            with self._open_doc(file_path) as doc:
+                # 检查前几页是否有文本内容；按块探测，避免拼接整页文本
+                for page_num in range(min(3, len(doc))):
+                    blocks = doc[page_num].get_text("blocks")
+                    # 块元组第 7 项为块类型，0 表示文本块（1 为图像块）
+                    if any(block[6] == 0 and block[4].strip() for block in blocks):
+                        return True
             
-            # 检查前几页是否有文本内容
-            for page_num in range(min(3, len(doc))):
-                page = doc[page_num]
-                text = page.get_text().strip()
-                if text:
-                    doc.close()
-                    return True
-            
-            doc.close()
             return False
             
         except Exception:
@@ -397,14 +804,12 @@ class PDFParser(StructuredParser):
         返回:
             合并的文本内容
         """
-        if "full_text" in structured_content:
-            return structured_content["full_text"]
+        if (full_text := structured_content.get("full_text")) is not None:
+            return full_text
         
         # 备用方法：合并页面内容
-        text_parts = []
-        if "pages" in structured_content:
-            for page in structured_content["pages"]:
-                if isinstance(page, dict) and "content" in page:
-                    text_parts.append(page["content"])
-        
-        return "\n\n".join(text_parts)
\ No newline at end of file
+        return "\n\n".join(
+            page.content if isinstance(page, PageInfo) else page["content"]
+            for page in structured_content.get("pages", ())
+            if isinstance(page, PageInfo) or (isinstance(page, dict) and "content" in page)
+        )
\ No newline at end of file
@@ -5,24 +5,105 @@ PowerPoint文档解析器
 
 import os
 import logging
-from typing import Dict, Any, List
+import posixpath
+import subprocess
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 import zipfile
-import xml.etree.ElementTree as ET
+from lxml import etree  # python-pptx 依赖 lxml
 
 from ..exceptions import ParsingError
+from ..utils import get_process_pool_context
 
 logger = logging.getLogger(__name__)
 
+# 支持的扩展名（str.endswith 可直接接受元组）
+_PPT_EXTENSIONS = ('.pptx', '.ppt')
+
+# 老版本 .ppt 文本提取：catppt（catdoc 工具集）命令及超时（秒）
+_CATPPT_COMMAND = 'catppt'
+_CATPPT_TIMEOUT = 30
+# catppt 输出的解码顺序：优先 UTF-8，中文环境下可能为 GB18030
+_CATPPT_ENCODINGS = ('utf-8', 'gb18030')
+
+# core.xml 中需要提取的元数据字段（按本地名匹配）
+_CORE_PROPERTY_NAMES = frozenset({'title', 'creator', 'subject', 'description'})
+
+# 核心属性缓存：(路径, 修改时间纳秒, 文件大小) -> 核心属性，按最近使用淘汰
+_CORE_PROPERTIES_CACHE_SIZE = 128
+_core_properties_cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+_core_properties_lock = threading.Lock()
+
+# OOXML 命名空间与标签（快速纯文本解析使用）
+_NS_P = 'http://schemas.openxmlformats.org/presentationml/2006/main'
+_NS_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+_NS_R = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_NS_PKG_REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+_TAG_SLIDE_ID = f'{{{_NS_P}}}sldId'
+_TAG_SHAPE = f'{{{_NS_P}}}sp'
+_TAG_PARAGRAPH = f'{{{_NS_A}}}p'
+_TAG_TEXT = f'{{{_NS_A}}}t'
+_TAG_RELATIONSHIP = f'{{{_NS_PKG_REL}}}Relationship'
+_ATTR_REL_ID = f'{{{_NS_R}}}id'
+_PATH_PLACEHOLDER = f'{{{_NS_P}}}nvSpPr/{{{_NS_P}}}nvPr/{{{_NS_P}}}ph'
+
+_REL_TYPE_NOTES_SLIDE = (
+    'http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide'
+)
+
+# 标题占位符类型
+_TITLE_PLACEHOLDER_TYPES = frozenset({'title', 'ctrTitle'})
+
+# python-pptx 形状类型常量（避免逐形状的枚举属性查找）
+_PICTURE = MSO_SHAPE_TYPE.PICTURE
+
+# 形状类型代码 -> 名称；幻灯片内容中只保存整数代码，需要名称时再查表
+_SHAPE_TYPE_NAMES = {int(member): member.name for member in MSO_SHAPE_TYPE}
+_UNKNOWN_SHAPE_TYPE = -1
+
+
+def shape_type_name(code: int) -> str:
+    """将幻灯片内容中的形状类型代码转换为名称"""
+    return _SHAPE_TYPE_NAMES.get(code, "UNKNOWN")
+
+
+def _get_cached_core_properties(key: Tuple[str, int, int]) -> Optional[Dict[str, Any]]:
+    """查找缓存的核心属性，命中时标记为最近使用"""
+    with _core_properties_lock:
+        properties = _core_properties_cache.get(key)
+        if properties is not None:
+            _core_properties_cache.move_to_end(key)
+        return properties
+
+
+def _cache_core_properties(key: Tuple[str, int, int], properties: Dict[str, Any]) -> None:
+    """写入核心属性缓存，超出容量时淘汰最久未使用的条目"""
+    with _core_properties_lock:
+        _core_properties_cache[key] = properties
+        _core_properties_cache.move_to_end(key)
+        if len(_core_properties_cache) > _CORE_PROPERTIES_CACHE_SIZE:
+            _core_properties_cache.popitem(last=False)
+
+
+def _parse_worker(file_path: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """进程池工作函数：在子进程中构造解析器并解析单个文件"""
+    # 解析器在子进程内创建，避免序列化分块器等实例状态
+    return PowerPointParser().parse(file_path, **kwargs)
+
 
 class PowerPointParser:
     """PowerPoint文档解析器"""
     
     def __init__(self):
         """初始化PowerPoint解析器"""
-        self.supported_extensions = ['.pptx', '.ppt']
+        self.supported_extensions = list(_PPT_EXTENSIONS)
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000,
             chunk_overlap=200,
@@ -31,7 +112,8 @@ class PowerPointParser:
     
     def can_parse(self, file_path: str) -> bool:
         """检查是否可以解析该文件"""
-        return any(file_path.lower().endswith(ext) for ext in self.supported_extensions)
+        # 只对末尾5个字符做小写转换，一次 endswith 匹配所有扩展名
+        return file_path[-5:].lower().endswith(_PPT_EXTENSIONS)
     
     def parse(self, file_path: str, **kwargs) -> Dict[str, Any]:
         """
@@ -43,6 +125,8 @@ class PowerPointParser:
                 - extract_notes: 是否提取备注，默认True
                 - extract_images: 是否提取图片信息，默认True
                 - include_slide_numbers: 是否包含幻灯片编号，默认True
+                - fast_text_only: 仅快速提取文本（不含表格和图片信息），默认False
+                - parallel: 是否使用线程池并行提取各幻灯片，默认False
         
         返回:
             解析结果字典
@@ -58,51 +142,55 @@ class PowerPointParser:
             return self._parse_legacy_ppt(file_path, **kwargs)
         
         try:
-            extract_notes = kwargs.get('extract_notes', True)
-            extract_images = kwargs.get('extract_images', True)
-            include_slide_numbers = kwargs.get('include_slide_numbers', True)
-            
             logger.info(f"开始解析PowerPoint文件: {file_path}")
             
-            # 加载演示文稿
-            presentation = Presentation(file_path)
+            # 演示文稿级图片登记表：图片内容哈希 -> 图片信息
+            image_registry: Dict[str, Dict[str, Any]] = {}
+            kwargs['image_registry'] = image_registry
             
             slides_info = []
             all_text_content = []
-            total_slides = len(presentation.slides)
+            # 有非空白文本的幻灯片，在提取循环中顺带记录，避免再对全文 strip
+            text_slides = []
             
-            for slide_idx, slide in enumerate(presentation.slides):
-                slide_number = slide_idx + 1
+            # 压缩包只打开一次，快速文本解析和元数据读取共用同一句柄
+            with zipfile.ZipFile(file_path, 'r') as zip_file:
+                kwargs['zip_file'] = zip_file
                 
-                # 提取幻灯片内容
-                slide_content = self._extract_slide_content(
-                    slide, 
-                    slide_number, 
-                    extract_notes=extract_notes,
-                    extract_images=extract_images,
-                    include_slide_numbers=include_slide_numbers
-                )
+                if kwargs.get('parallel', False) and not kwargs.get('fast_text_only', False):
+                    slide_iter = iter(self._extract_slides_parallel(file_path, **kwargs))
+                else:
+                    slide_iter = self._iter_slides(file_path, **kwargs)
                 
-                slides_info.append(slide_content)
+                # 逐张消费幻灯片，边提取边格式化文本
+                for slide_content in slide_iter:
+                    slides_info.append(slide_content)
+                    slide_text = self._format_slide_text(slide_content)
+                    all_text_content.append(slide_text)
+                    if slide_text and not slide_text.isspace():
+                        text_slides.append(slide_text)
                 
-                # 收集文本内容
-                slide_text = self._format_slide_text(slide_content)
-                all_text_content.append(slide_text)
+                # 获取演示文稿元数据
+                metadata = self._get_presentation_metadata(file_path, zip_file=zip_file)
+            
+            total_slides = len(slides_info)
             
             # 合并所有文本内容
             full_text = "\n\n".join(all_text_content)
             
-            # 文本分块
-            chunks = self.text_splitter.split_text(full_text) if full_text.strip() else []
-            
-            # 获取演示文稿元数据
-            metadata = self._get_presentation_metadata(file_path)
+            # 文本分块：按幻灯片分别切分，幻灯片边界即块边界，减少切分器回溯
+            chunks = [
+                chunk
+                for slide_text in text_slides
+                for chunk in self.text_splitter.split_text(slide_text)
+            ]
             
             result = {
                 "file_path": file_path,
                 "file_type": "powerpoint",
                 "total_slides": total_slides,
                 "slides": slides_info,
+                "images": image_registry,
                 "full_text": full_text,
                 "chunks": chunks,
                 "chunk_count": len(chunks),
@@ -116,11 +204,246 @@ class PowerPointParser:
             logger.error(f"PowerPoint文件解析失败: {file_path}, 错误: {e}")
             raise ParsingError(f"PowerPoint解析失败: {str(e)}")
     
+    def parse_many(
+        self,
+        file_paths: List[str],
+        workers: Optional[int] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        使用进程池批量解析多个PowerPoint文件
+        
+        每个文件的解压、关系图构建和 XML 解析彼此独立，按文件分发到
+        子进程可充分利用多核，且不受 GIL 限制。
+        
+        参数:
+            file_paths: PowerPoint文件路径列表
+            workers: 工作进程数，默认为 CPU 核数
+            **kwargs: 传给 parse 的解析参数
+        
+        返回:
+            与 file_paths 顺序一致的解析结果列表
+        """
+        if len(file_paths) <= 1:
+            # 单个文件无需承担进程启动开销
+            return [self.parse(file_path, **kwargs) for file_path in file_paths]
+        
+        # 与 PDF 解析器相同的启动方式，避免在多线程服务器进程中 fork
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_process_pool_context()
+        ) as executor:
+            return list(executor.map(
+                functools.partial(_parse_worker, kwargs=kwargs),
+                file_paths
+            ))
+    
+    def lazy_parse(self, file_path: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        流式解析PowerPoint文件，逐张生成幻灯片内容
+        
+        不汇总全文也不分块，适合只需逐张处理幻灯片的调用方（如 RAG 索引）。
+        
+        参数:
+            file_path: PowerPoint文件路径
+            **kwargs: 与 parse 相同的提取参数（parallel 除外）；
+                可传入 image_registry 字典以收集图片引用对应的图片信息
+        
+        生成:
+            幻灯片内容字典
+        """
+        if not os.path.exists(file_path):
+            raise ParsingError(f"文件不存在: {file_path}")
+        
+        if not self.can_parse(file_path):
+            raise ParsingError(f"不支持的文件格式: {file_path}")
+        
+        if file_path.lower().endswith('.ppt'):
+            yield from self._parse_legacy_ppt(file_path, **kwargs)["slides"]
+            return
+        
+        yield from self._iter_slides(file_path, **kwargs)
+    
+    def _iter_slides(self, file_path: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """按顺序逐张生成 .pptx 幻灯片内容"""
+        extract_notes = kwargs.get('extract_notes', True)
+        include_slide_numbers = kwargs.get('include_slide_numbers', True)
+        
+        if kwargs.get('fast_text_only', False):
+            # 仅提取文本：直接流式读取幻灯片 XML，不构建 python-pptx 对象树
+            yield from self._iter_pptx_fast(
+                file_path,
+                extract_notes=extract_notes,
+                include_slide_numbers=include_slide_numbers,
+                zip_file=kwargs.get('zip_file')
+            )
+            return
+        
+        # 加载演示文稿
+        presentation = Presentation(file_path)
+        
+        for slide_idx, slide in enumerate(presentation.slides):
+            # 提取幻灯片内容
+            yield self._extract_slide_content(
+                slide,
+                slide_idx + 1,
+                extract_notes=extract_notes,
+                extract_images=kwargs.get('extract_images', True),
+                include_slide_numbers=include_slide_numbers,
+                image_registry=kwargs.get('image_registry')
+            )
+    
+    def _extract_slides_parallel(self, file_path: str, **kwargs) -> List[Dict[str, Any]]:
+        """使用线程池并行提取各幻灯片内容"""
+        presentation = Presentation(file_path)
+        extract_options = {
+            "extract_notes": kwargs.get('extract_notes', True),
+            "extract_images": kwargs.get('extract_images', True),
+            "include_slide_numbers": kwargs.get('include_slide_numbers', True),
+            "image_registry": kwargs.get('image_registry')
+        }
+        
+        # 各幻灯片的形状树相互独立，lxml 的 C 层操作可在线程间重叠；map 保持顺序
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            return list(executor.map(
+                lambda item: self._extract_slide_content(item[1], item[0] + 1, **extract_options),
+                enumerate(presentation.slides)
+            ))
+    
+    def _iter_pptx_fast(
+        self,
+        file_path: str,
+        extract_notes: bool = True,
+        include_slide_numbers: bool = True,
+        zip_file: Optional[zipfile.ZipFile] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        快速纯文本解析：直接读取 .pptx 压缩包中的幻灯片 XML。
+        
+        不实例化 python-pptx 的形状对象，也不解码图片；只提取文本框中的
+        文字（标题、正文和备注），不包含表格和图片信息。
+        
+        参数:
+            file_path: .pptx 文件路径
+            extract_notes: 是否提取备注
+            include_slide_numbers: 是否包含幻灯片编号
+            zip_file: 已打开的压缩包句柄；为 None 时自行打开 file_path
+        
+        生成:
+            与 _extract_slide_content 结构相同的幻灯片内容
+        """
+        if zip_file is None:
+            with zipfile.ZipFile(file_path, 'r') as zip_file:
+                yield from self._iter_pptx_fast(
+                    file_path, extract_notes, include_slide_numbers, zip_file=zip_file
+                )
+            return
+        
+        for slide_idx, slide_part in enumerate(self._get_slide_part_names(zip_file)):
+            slide_number = slide_idx + 1
+            slide_content = {
+                "slide_number": slide_number if include_slide_numbers else None,
+                "title": "",
+                "content": [],
+                "notes": "",
+                "images": [],
+                "tables": [],
+                "shapes": []
+            }
+            
+            for placeholder_type, text in self._iter_shape_texts(zip_file, slide_part):
+                if not text:
+                    continue
+                if placeholder_type in _TITLE_PLACEHOLDER_TYPES and not slide_content["title"]:
+                    slide_content["title"] = text
+                else:
+                    slide_content["content"].append(text)
+            
+            if extract_notes:
+                rels = self._read_part_rels(zip_file, slide_part)
+                notes_part = next(
+                    (target for rel_type, target in rels.values() if rel_type == _REL_TYPE_NOTES_SLIDE),
+                    None
+                )
+                if notes_part:
+                    for placeholder_type, text in self._iter_shape_texts(zip_file, notes_part):
+                        if placeholder_type == 'body' and text and not text.startswith("单击此处"):
+                            slide_content["notes"] = text
+                            break
+            
+            yield slide_content
+    
+    def _get_slide_part_names(self, zip_file: zipfile.ZipFile) -> List[str]:
+        """按演示文稿中的顺序获取幻灯片部件名"""
+        rels = self._read_part_rels(zip_file, 'ppt/presentation.xml')
+        
+        slide_parts = []
+        with zip_file.open('ppt/presentation.xml') as presentation_file:
+            for _, elem in etree.iterparse(presentation_file, events=('end',), tag=_TAG_SLIDE_ID):
+                rel = rels.get(elem.get(_ATTR_REL_ID))
+                if rel is not None:
+                    slide_parts.append(rel[1])
+                elem.clear()
+        
+        return slide_parts
+    
+    def _read_part_rels(self, zip_file: zipfile.ZipFile, part_name: str) -> Dict[str, Tuple[str, str]]:
+        """
+        读取部件的关系文件。
+        
+        返回:
+            关系 ID 到 (关系类型, 目标部件名) 的字典
+        """
+        part_dir, part_file = posixpath.split(part_name)
+        rels_name = posixpath.join(part_dir, '_rels', f"{part_file}.rels")
+        
+        rels = {}
+        try:
+            rels_file = zip_file.open(rels_name)
+        except KeyError:
+            return rels
+        
+        with rels_file:
+            for _, elem in etree.iterparse(rels_file, events=('end',), tag=_TAG_RELATIONSHIP):
+                if elem.get('TargetMode') != 'External':
+                    target = elem.get('Target', '')
+                    if target.startswith('/'):
+                        target_part = target.lstrip('/')
+                    else:
+                        target_part = posixpath.normpath(posixpath.join(part_dir, target))
+                    rels[elem.get('Id')] = (elem.get('Type'), target_part)
+                elem.clear()
+        
+        return rels
+    
+    def _iter_shape_texts(self, zip_file: zipfile.ZipFile, part_name: str) -> Iterator[Tuple[Optional[str], str]]:
+        """
+        流式遍历部件中的文本形状。
+        
+        生成:
+            (占位符类型, 形状文本) 元组；非占位符形状的类型为 None，
+            未声明类型的占位符视为 'body'
+        """
+        with zip_file.open(part_name) as part_file:
+            for _, elem in etree.iterparse(part_file, events=('end',), tag=_TAG_SHAPE):
+                placeholder = elem.find(_PATH_PLACEHOLDER)
+                placeholder_type = None
+                if placeholder is not None:
+                    placeholder_type = placeholder.get('type', 'body')
+                
+                paragraphs = [
+                    "".join(t.text for t in paragraph.iter(_TAG_TEXT) if t.text)
+                    for paragraph in elem.iter(_TAG_PARAGRAPH)
+                ]
+                yield placeholder_type, "\n".join(paragraphs).strip()
+                elem.clear()
+    
     def _extract_slide_content(self, slide, slide_number: int, **kwargs) -> Dict[str, Any]:
         """提取单张幻灯片的内容"""
         extract_notes = kwargs.get('extract_notes', True)
         extract_images = kwargs.get('extract_images', True)
         include_slide_numbers = kwargs.get('include_slide_numbers', True)
+        image_registry = kwargs.get('image_registry')
         
         slide_content = {
             "slide_number": slide_number if include_slide_numbers else None,
@@ -132,39 +455,45 @@ class PowerPointParser:
             "shapes": []
         }
         
+        # 标题占位符（idx 0）直接从占位符映射获取，不必逐个检查形状的占位符格式
+        title_shape = slide.shapes.title
+        title_shape_id = title_shape.shape_id if title_shape is not None else None
+        
         # 提取幻灯片标题和内容
         for shape in slide.shapes:
             try:
-                if shape.has_text_frame:
-                    text = shape.text.strip()
-                    if text:
-                        # 判断是否为标题
-                        if shape.shape_type == MSO_SHAPE_TYPE.PLACEHOLDER:
-                            try:
-                                placeholder = shape.placeholder_format
-                                if placeholder.type == 1:  # 标题占位符
-                                    slide_content["title"] = text
-                                else:
-                                    slide_content["content"].append(text)
-                            except:
-                                slide_content["content"].append(text)
-                        else:
-                            slide_content["content"].append(text)
+                # 每个形状只读取一次文本和类型（python-pptx 的属性会遍历 XML）
+                has_text_frame = shape.has_text_frame
+                text = shape.text.strip() if has_text_frame else ""
+                shape_type = shape.shape_type
+                
+                if text:
+                    # 判断是否为标题
+                    if shape.shape_id == title_shape_id:
+                        slide_content["title"] = text
+                    else:
+                        slide_content["content"].append(text)
                 
                 # 提取图片信息
-                if extract_images and shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+                if extract_images and shape_type == _PICTURE:
                     try:
-                        image_info = {
+                        # 同一图片（如模板 Logo）按内容哈希只登记一次，各处仅保存引用和位置
+                        image = shape.image
+                        image_ref = image.sha1
+                        if image_registry is not None and image_ref not in image_registry:
+                            image_registry[image_ref] = {
+                                "filename": getattr(image, 'filename', None) or 'unknown',
+                                "content_type": image.content_type,
+                                "size": len(image.blob)
+                            }
+                        slide_content["images"].append({
                             "type": "image",
+                            "ref": image_ref,
                             "width": shape.width,
                             "height": shape.height,
                             "left": shape.left,
                             "top": shape.top
-                        }
-                        # 尝试获取图片名称
-                        if hasattr(shape, 'image'):
-                            image_info["filename"] = getattr(shape.image, 'filename', 'unknown')
-                        slide_content["images"].append(image_info)
+                        })
                     except Exception as e:
                         logger.debug(f"提取图片信息失败: {e}")
                 
@@ -178,8 +507,8 @@ class PowerPointParser:
                 
                 # 记录其他形状类型
                 shape_info = {
-                    "type": str(shape.shape_type),
-                    "has_text": shape.has_text_frame and bool(shape.text.strip())
+                    "type": int(shape_type) if shape_type is not None else _UNKNOWN_SHAPE_TYPE,
+                    "has_text": bool(text)
                 }
                 slide_content["shapes"].append(shape_info)
                 
@@ -204,53 +533,69 @@ class PowerPointParser:
     
     def _extract_table_data(self, table) -> Dict[str, Any]:
         """提取表格数据"""
-        table_data = {
-            "rows": table.rows.__len__(),
-            "columns": table.columns.__len__(),
-            "data": []
-        }
+        rows = table.rows
         
-        for row in table.rows:
-            row_data = []
-            for cell in row.cells:
-                cell_text = cell.text.strip() if cell.text else ""
-                row_data.append(cell_text)
-            table_data["data"].append(row_data)
-        
-        return table_data
+        # cell.text 每次访问都会遍历单元格 XML，只读取一次
+        return {
+            "rows": len(rows),
+            "columns": len(table.columns),
+            "data": [
+                [(cell.text or "").strip() for cell in row.cells]
+                for row in rows
+            ]
+        }
     
     def _format_slide_text(self, slide_content: Dict[str, Any]) -> str:
         """将幻灯片内容格式化为文本"""
         lines = []
+        append = lines.append
         
-        if slide_content.get("slide_number"):
-            lines.append(f"幻灯片 {slide_content['slide_number']}")
+        # 每个字段只查找一次
+        slide_number = slide_content.get("slide_number")
+        title = slide_content.get("title")
+        contents = slide_content.get("content")
+        tables = slide_content.get("tables")
+        notes = slide_content.get("notes")
+        images = slide_content.get("images")
         
-        if slide_content.get("title"):
-            lines.append(f"标题: {slide_content['title']}")
+        if slide_number:
+            append("幻灯片 " + str(slide_number))
         
-        if slide_content.get("content"):
-            lines.append("内容:")
-            for content in slide_content["content"]:
-                lines.append(f"- {content}")
+        if title:
+            append("标题: " + title)
         
-        if slide_content.get("tables"):
-            lines.append("表格:")
-            for i, table in enumerate(slide_content["tables"]):
-                lines.append(f"表格 {i+1}:")
-                for row in table["data"]:
-                    lines.append(" | ".join(row))
+        if contents:
+            append("内容:")
+            lines.extend("- " + content for content in contents)
         
-        if slide_content.get("notes"):
-            lines.append(f"备注: {slide_content['notes']}")
+        if tables:
+            append("表格:")
+            for i, table in enumerate(tables, 1):
+                append("表格 " + str(i) + ":")
+                if table["data"]:
+                    # 整张表格的行一次性拼接
+                    append("\n".join(" | ".join(row) for row in table["data"]))
         
-        if slide_content.get("images"):
-            lines.append(f"图片数量: {len(slide_content['images'])}")
+        if notes:
+            append("备注: " + notes)
+        
+        if images:
+            append("图片数量: " + str(len(images)))
         
         return "\n".join(lines)
     
-    def _get_presentation_metadata(self, file_path: str) -> Dict[str, Any]:
-        """获取演示文稿元数据"""
+    def _get_presentation_metadata(
+        self,
+        file_path: str,
+        zip_file: Optional[zipfile.ZipFile] = None
+    ) -> Dict[str, Any]:
+        """
+        获取演示文稿元数据
+        
+        参数:
+            file_path: PowerPoint文件路径
+            zip_file: 已打开的压缩包句柄；为 None 时按需自行打开 file_path
+        """
         metadata = {}
         
         try:
@@ -263,52 +608,59 @@ class PowerPointParser:
             })
             
             # 尝试从PPTX文件中提取更多元数据
-            if file_path.lower().endswith('.pptx'):
-                try:
-                    with zipfile.ZipFile(file_path, 'r') as zip_file:
-                        # 读取核心属性
-                        if 'docProps/core.xml' in zip_file.namelist():
-                            core_xml = zip_file.read('docProps/core.xml')
-                            root = ET.fromstring(core_xml)
-                            
-                            # 定义命名空间
-                            ns = {
-                                'cp': 'http://schemas.openxmlformats.org/package/2006/metadata/core-properties',
-                                'dc': 'http://purl.org/dc/elements/1.1/',
-                                'dcterms': 'http://purl.org/dc/terms/'
-                            }
-                            
-                            # 提取元数据
-                            title_elem = root.find('.//dc:title', ns)
-                            if title_elem is not None:
-                                metadata['title'] = title_elem.text
-                            
-                            creator_elem = root.find('.//dc:creator', ns)
-                            if creator_elem is not None:
-                                metadata['creator'] = creator_elem.text
-                            
-                            subject_elem = root.find('.//dc:subject', ns)
-                            if subject_elem is not None:
-                                metadata['subject'] = subject_elem.text
-                            
-                            description_elem = root.find('.//dc:description', ns)
-                            if description_elem is not None:
-                                metadata['description'] = description_elem.text
-                
-                except Exception as e:
-                    logger.debug(f"提取PPTX元数据失败: {e}")
+            if zip_file is not None or file_path.lower().endswith('.pptx'):
+                # 同一文件未修改时重复解析（索引、重建索引等）直接命中缓存
+                cache_key = (file_path, stat.st_mtime_ns, stat.st_size)
+                core_properties = _get_cached_core_properties(cache_key)
+                if core_properties is None:
+                    if zip_file is not None:
+                        core_properties = self._read_core_properties(zip_file)
+                    else:
+                        with zipfile.ZipFile(file_path, 'r') as zip_file:
+                            core_properties = self._read_core_properties(zip_file)
+                    _cache_core_properties(cache_key, core_properties)
+                metadata.update(core_properties)
         
         except Exception as e:
             logger.debug(f"获取演示文稿元数据失败: {e}")
         
         return metadata
     
+    def _read_core_properties(self, zip_file: zipfile.ZipFile) -> Dict[str, Any]:
+        """从 docProps/core.xml 读取核心属性"""
+        found = {}
+        
+        try:
+            core_file = zip_file.open('docProps/core.xml')
+        except KeyError:
+            return found
+        
+        try:
+            # 流式解析核心属性，处理完的元素立即清除，找齐所需字段即停止
+            with core_file:
+                for _, elem in etree.iterparse(
+                    core_file, events=('end',), remove_blank_text=True
+                ):
+                    name = elem.tag.rpartition('}')[2]
+                    if name in _CORE_PROPERTY_NAMES:
+                        found[name] = elem.text
+                    elem.clear()
+                    if len(found) == len(_CORE_PROPERTY_NAMES):
+                        break
+        except Exception as e:
+            logger.debug(f"提取PPTX元数据失败: {e}")
+        
+        return found
+    
     def _parse_legacy_ppt(self, file_path: str, **kwargs) -> Dict[str, Any]:
         """解析老版本.ppt文件"""
         try:
-            # 对于.ppt文件，我们提供有限的支持
-            # 可以尝试使用python-pptx的一些基本功能，但功能会受限
+            # 优先使用 catppt（C 实现的独立程序）提取文本，无需启动 LibreOffice
+            text = self._extract_legacy_ppt_text(file_path)
+            if text is not None:
+                return self._build_legacy_ppt_result(file_path, text, **kwargs)
             
+            # 未安装 catppt 时提供有限的支持
             logger.warning(f"解析.ppt文件支持有限: {file_path}")
             
             result = {
@@ -332,6 +684,73 @@ class PowerPointParser:
             logger.error(f".ppt文件解析失败: {e}")
             raise ParsingError(f".ppt文件解析失败: {str(e)}")
     
+    def _extract_legacy_ppt_text(self, file_path: str) -> Optional[str]:
+        """
+        使用 catppt 提取 .ppt 文件文本
+        
+        返回:
+            提取的文本；未安装 catppt 时返回 None
+        """
+        try:
+            result = subprocess.run(
+                [_CATPPT_COMMAND, '-d', 'utf-8', file_path],
+                capture_output=True,
+                timeout=_CATPPT_TIMEOUT
+            )
+        except FileNotFoundError:
+            logger.debug("未安装 catppt，无法提取.ppt文本")
+            return None
+        
+        if result.returncode != 0:
+            stderr = result.stderr.decode('utf-8', errors='replace').strip()
+            raise ParsingError(f"catppt 提取失败: {stderr or result.returncode}")
+        
+        output = result.stdout
+        for encoding in _CATPPT_ENCODINGS:
+            try:
+                return output.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+        return output.decode('utf-8', errors='replace')
+    
+    def _build_legacy_ppt_result(self, file_path: str, text: str, **kwargs) -> Dict[str, Any]:
+        """根据 catppt 输出构建与 .pptx 相同结构的解析结果"""
+        include_slide_numbers = kwargs.get('include_slide_numbers', True)
+        
+        # catppt 以换页符分隔幻灯片；没有换页符时整体视为一张
+        slide_texts = [block.strip() for block in text.split('\f')]
+        slide_texts = [block for block in slide_texts if block]
+        
+        slides_info = [
+            {
+                "slide_number": slide_number if include_slide_numbers else None,
+                "title": "",
+                "content": [line.strip() for line in block.splitlines() if line.strip()],
+                "notes": "",
+                "images": [],
+                "tables": [],
+                "shapes": []
+            }
+            for slide_number, block in enumerate(slide_texts, 1)
+        ]
+        
+        full_text = "\n\n".join(slide_texts)
+        chunks = self.text_splitter.split_text(full_text) if slide_texts else []
+        
+        metadata = self._get_presentation_metadata(file_path)
+        metadata["extraction_method"] = _CATPPT_COMMAND
+        
+        return {
+            "file_path": file_path,
+            "file_type": "powerpoint_legacy",
+            "total_slides": len(slides_info),
+            "slides": slides_info,
+            "full_text": full_text,
+            "chunks": chunks,
+            "chunk_count": len(chunks),
+            "metadata": metadata
+        }
+    
     def get_slide_count(self, file_path: str) -> int:
         """获取幻灯片数量"""
         try:
@@ -355,15 +774,10 @@ class PowerPointParser:
             titles = []
             
             for slide in presentation.slides:
+                title_shape = slide.shapes.title
                 title = ""
-                for shape in slide.shapes:
-                    if shape.has_text_frame and shape.shape_type == MSO_SHAPE_TYPE.PLACEHOLDER:
-                        try:
-                            if shape.placeholder_format.type == 1:  # 标题占位符
-                                title = shape.text.strip()
-                                break
-                        except:
-                            continue
+                if title_shape is not None and title_shape.has_text_frame:
+                    title = title_shape.text.strip()
                 
                 titles.append(title or f"幻灯片 {len(titles) + 1}")
             
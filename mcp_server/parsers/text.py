@@ -6,16 +6,118 @@ MCP 服务器文本文档解析器
 """
 
 import os
+import re
+import json
+import hashlib
 import logging
-from typing import Dict, Any
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Any, Optional, Tuple
 
-from ..types import ParseResult, FileType
+try:
+    from charset_normalizer import from_bytes as detect_charset
+except ImportError:
+    detect_charset = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+from ..types import ParseResult, FileType, ParserStatus
 from ..exceptions import ParsingError, EmptyDocumentError, EncodingError
+from ..utils import clean_text
 from .base import TextBasedParser
 from ..config import config
 
 logger = logging.getLogger(__name__)
 
+# 编码检测只看文件开头的一段字节
+ENCODING_SNIFF_BYTES = 64 * 1024
+
+# 无法检测编码时依次尝试的编码
+_FALLBACK_ENCODINGS = ('utf-8', 'utf-16', 'latin1', 'cp1252', 'gbk', 'gb2312')
+
+# CSV 分隔符投票使用的文本样本长度（字符）
+CSV_DELIMITER_SAMPLE_CHARS = 8 * 1024
+
+# 语言特征缓存：(内容摘要, 内容长度, 语言) -> 特征，按最近使用淘汰
+LANGUAGE_FEATURES_CACHE_SIZE = 256
+_language_features_cache: "OrderedDict[Tuple[Any, int, str], Dict[str, Any]]" = OrderedDict()
+_language_features_lock = threading.Lock()
+
+# 非空行：行首到第一个非空白字符（不跨越换行）
+_NONEMPTY_LINE_RE = re.compile(r'^[^\S\n]*\S', re.MULTILINE)
+
+# 语言特征分析使用的正则表达式，模块加载时编译一次
+_PY_IMPORT_RE = re.compile(r'^(?:from\s+\S+\s+)?import\s+', re.MULTILINE)
+_PY_DEF_RE = re.compile(r'^def\s+\w+\s*\(', re.MULTILINE)
+_PY_CLASS_RE = re.compile(r'^class\s+\w+', re.MULTILINE)
+_PY_DOCSTRING_DOUBLE_RE = re.compile(r'""".*?"""', re.DOTALL)
+_PY_DOCSTRING_SINGLE_RE = re.compile(r"'''.*?'''", re.DOTALL)
+_HASH_COMMENT_RE = re.compile(r'#.*$', re.MULTILINE)
+
+_JS_FUNCTION_RE = re.compile(r'function\s+\w+\s*\(')
+_JS_ARROW_FUNCTION_RE = re.compile(r'\w+\s*=\s*\([^)]*\)\s*=>')
+_JS_IMPORT_RE = re.compile(r'^(?:import|const\s+\w+\s*=\s*require)', re.MULTILINE)
+
+_C_FUNCTION_RE = re.compile(r'\w+\s+\w+\s*\([^)]*\)\s*{')
+_C_INCLUDE_SYSTEM_RE = re.compile(r'^#include\s*<[^>]+>', re.MULTILINE)
+_C_INCLUDE_LOCAL_RE = re.compile(r'^#include\s*"[^"]+"', re.MULTILINE)
+
+# 注释模式统计的是"包含注释标记的行数"（含行内注释），不能简单换成 str.count('\n//')；
+# 调用处先用子串判断标记是否存在，没有时跳过正则扫描
+_LINE_COMMENT_RE = re.compile(r'//.*$', re.MULTILINE)
+_BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+_YAML_KEY_VALUE_RE = re.compile(r'^\s*\w+\s*:', re.MULTILINE)
+_YAML_LIST_ITEM_RE = re.compile(r'^\s*-\s+', re.MULTILINE)
+
+# 日志级别与时间戳合并为一个模式，按命名分组计数，一次扫描完成
+_LOG_FEATURE_RE = re.compile(
+    r'\b(?P<error>ERROR|ERR)\b'
+    r'|\b(?P<warning>WARNING|WARN)\b'
+    r'|\b(?P<info>INFO|INF)\b'
+    r'|\b(?P<debug>DEBUG|DBG)\b'
+    r'|(?P<timestamp>'
+    r'\d{4}-\d{2}-\d{2}'  # YYYY-MM-DD
+    r'|\d{2}/\d{2}/\d{4}'  # MM/DD/YYYY
+    r'|\d{2}:\d{2}:\d{2}'  # HH:MM:SS
+    r')',
+    re.IGNORECASE
+)
+
+_URL_RE = re.compile(r'https?://[^\s]+')
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_NUMBER_RE = re.compile(r'\b\d+\.?\d*\b')
+
+
+def _content_digest(content: str) -> Any:
+    """计算文本内容摘要，安装了 xxhash 时使用更快的 XXH3"""
+    data = content.encode('utf-8', 'surrogatepass')
+    if xxhash is not None:
+        return xxhash.xxh3_128_intdigest(data)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _max_line_length(content: str) -> int:
+    """按换行符位置计算最长行的长度，不构建行列表（大文件不产生整份内容的副本）"""
+    find = content.find
+    max_length = 0
+    start = 0
+    end = find('\n')
+    while end != -1:
+        if end - start > max_length:
+            max_length = end - start
+        start = end + 1
+        end = find('\n', start)
+    return max(max_length, len(content) - start)
+
 
 class TextParser(TextBasedParser):
     """
@@ -104,7 +206,6 @@ class TextParser(TextBasedParser):
                         logger.info(f"使用文本解析缓存: {file_path}")
                         
                         # 从缓存构造结果
-                        from ..types import ParserStatus
                         return ParseResult(
                             success=True,
                             file_path=file_path,
@@ -142,24 +243,7 @@ class TextParser(TextBasedParser):
             包含提取内容和元数据的 ParseResult
         """
         try:
-            # 尝试不同编码
-            content = None
-            encoding_used = None
-            
-            for encoding in ['utf-8', 'utf-16', 'latin1', 'cp1252', 'gbk', 'gb2312']:
-                try:
-                    content = self.extract_text_from_file(file_path, encoding)
-                    encoding_used = encoding
-                    break
-                except (UnicodeDecodeError, EncodingError):
-                    continue
-            
-            if content is None:
-                raise EncodingError(
-                    file_path=file_path,
-                    encoding="unknown",
-                    error_details="无法使用任何支持的编码解码文件"
-                )
+            content, encoding_used, file_size = self._read_text_file(file_path)
             
             if not content.strip():
                 raise EmptyDocumentError(file_path, "TextParser")
@@ -176,7 +260,7 @@ class TextParser(TextBasedParser):
                 "char_count": len(content),
                 "word_count": structured_content.get("word_count", 0),
                 "non_empty_lines": structured_content.get("non_empty_lines", 0),
-                "file_size": os.path.getsize(file_path),
+                "file_size": file_size,
                 "statistics": structured_content.get("statistics", {}),
                 "language_features": structured_content.get("language_features", {}),
                 "parsing_method": f"TextParser ({encoding_used})"
@@ -198,6 +282,98 @@ class TextParser(TextBasedParser):
                 error=f"文本解析失败: {str(e)}"
             )
     
+    def _read_text_file(self, file_path: str) -> Tuple[str, str, int]:
+        """
+        读取文本文件，只读取和解码一次。
+        
+        参数:
+            file_path: 文本文件路径
+            
+        返回:
+            (清理后的文本内容, 使用的编码, 文件字节数) 元组
+            
+        引发:
+            EncodingError: 如果无法确定文件编码
+        """
+        # 无缓冲一次读取：FileIO.readall 按文件大小预分配，直接读入结果 bytes，
+        # 不经过缓冲区拷贝，也不用拼接开头和剩余部分
+        with open(file_path, 'rb', buffering=0) as f:
+            data = f.read()
+        
+        # 文件大小直接取已读取的字节数，无需再 stat
+        content, encoding = self._decode_text(data, file_path)
+        return content, encoding, len(data)
+    
+    def _decode_text(self, data: bytes, file_path: str) -> Tuple[str, str]:
+        """
+        解码文件字节。
+        
+        参数:
+            data: 文件的全部字节
+            file_path: 文本文件路径（用于错误信息）
+            
+        返回:
+            (清理后的文本内容, 使用的编码) 元组
+            
+        引发:
+            EncodingError: 如果无法确定文件编码
+        """
+        # 源代码等纯 ASCII 文件：ASCII 是 UTF-8 的子集，一次扫描即可确定，无需检测
+        if data.isascii():
+            return clean_text(data.decode('ascii')), 'utf-8'
+        
+        # 绝大多数文件是 UTF-8：先对整段字节做一次严格解码（C 实现，带 ASCII 快速路径），
+        # 失败时才进行编码检测
+        try:
+            return clean_text(data.decode('utf-8')), 'utf-8'
+        except UnicodeDecodeError:
+            pass
+        
+        encoding = self._detect_encoding(data[:ENCODING_SNIFF_BYTES])
+        if encoding is not None:
+            content = data.decode(encoding, errors='replace')
+        else:
+            # 检测失败时在内存中的字节上逐个尝试编码，不再重复读取文件
+            content = None
+            for encoding in _FALLBACK_ENCODINGS:
+                try:
+                    content = data.decode(encoding)
+                    break
+                except UnicodeDecodeError:
+                    continue
+            
+            if content is None:
+                raise EncodingError(
+                    file_path=file_path,
+                    encoding="unknown",
+                    error_details="无法使用任何支持的编码解码文件"
+                )
+        
+        return clean_text(content), encoding
+    
+    def _detect_encoding(self, sniff: bytes) -> Optional[str]:
+        """
+        根据文件开头的字节检测编码。
+        
+        参数:
+            sniff: 文件开头的字节
+            
+        返回:
+            编码名称；无法检测时返回 None
+        """
+        if not sniff:
+            return 'utf-8'
+        
+        if detect_charset is None:
+            return None
+        
+        best = detect_charset(sniff).best()
+        if best is None:
+            return None
+        
+        # 开头为纯 ASCII 时按 UTF-8 解码，以兼容后面出现的非 ASCII 字符
+        return 'utf-8' if best.encoding == 'ascii' else best.encoding
+    
     def _analyze_text_content(self, content: str, file_path: str) -> Dict[str, Any]:
         """
         分析文本内容并提取统计信息。
@@ -209,19 +385,19 @@ class TextParser(TextBasedParser):
         返回:
             包含文本分析结果的字典
         """
-        lines = content.split('\n')
         words = content.split()
         
-        # 基本统计
-        line_count = len(lines)
+        # 基本统计：行数和非空行数直接在字符串上计数，不构建行列表
+        newline_count = content.count('\n')
+        line_count = newline_count + 1
         word_count = len(words)
         char_count = len(content)
-        non_empty_lines = len([line for line in lines if line.strip()])
+        non_empty_lines = len(_NONEMPTY_LINE_RE.findall(content))
         
         # 高级统计
-        avg_line_length = sum(len(line) for line in lines) / line_count if line_count > 0 else 0
-        max_line_length = max(len(line) for line in lines) if lines else 0
-        avg_word_length = sum(len(word) for word in words) / word_count if word_count > 0 else 0
+        avg_line_length = (char_count - newline_count) / line_count
+        max_line_length = _max_line_length(content) if newline_count else char_count
+        avg_word_length = sum(map(len, words)) / word_count if word_count > 0 else 0
         
         # 语言特定分析
         language = self._detect_language(file_path)
@@ -270,6 +446,26 @@ class TextParser(TextBasedParser):
         返回:
             包含语言特定功能的字典
         """
+        # 同一内容重复解析（如刷新索引）时直接复用上次的分析结果
+        cache_key = (_content_digest(content), len(content), language)
+        with _language_features_lock:
+            features = _language_features_cache.get(cache_key)
+            if features is not None:
+                _language_features_cache.move_to_end(cache_key)
+                return dict(features)
+        
+        features = self._compute_language_features(content, language)
+        
+        with _language_features_lock:
+            _language_features_cache[cache_key] = features
+            _language_features_cache.move_to_end(cache_key)
+            if len(_language_features_cache) > LANGUAGE_FEATURES_CACHE_SIZE:
+                _language_features_cache.popitem(last=False)
+        
+        return dict(features)
+    
+    def _compute_language_features(self, content: str, language: str) -> Dict[str, Any]:
+        """按语言分派到具体的特征分析方法。"""
         features = {}
         
         if language == 'python':
@@ -293,23 +489,22 @@ class TextParser(TextBasedParser):
     
     def _analyze_python_features(self, content: str) -> Dict[str, Any]:
         """分析 Python 特定功能。"""
-        import re
-        
         # 计算导入语句
-        import_count = len(re.findall(r'^(?:from\s+\S+\s+)?import\s+', content, re.MULTILINE))
+        import_count = len(_PY_IMPORT_RE.findall(content))
         
         # 计算函数定义
-        function_count = len(re.findall(r'^def\s+\w+\s*\(', content, re.MULTILINE))
+        function_count = len(_PY_DEF_RE.findall(content))
         
         # 计算类定义
-        class_count = len(re.findall(r'^class\s+\w+', content, re.MULTILINE))
+        class_count = len(_PY_CLASS_RE.findall(content))
         
         # 计算注释
-        comment_count = len(re.findall(r'#.*$', content, re.MULTILINE))
+        comment_count = len(_HASH_COMMENT_RE.findall(content)) if '#' in content else 0
         
         # 计算文档字符串
-        docstring_count = len(re.findall(r'""".*?"""', content, re.DOTALL))
-        docstring_count += len(re.findall(r"'''.*?'''", content, re.DOTALL))
+        docstring_count = len(_PY_DOCSTRING_DOUBLE_RE.findall(content)) if '"""' in content else 0
+        if "'''" in content:
+            docstring_count += len(_PY_DOCSTRING_SINGLE_RE.findall(content))
         
         return {
             "imports": import_count,
@@ -321,18 +516,16 @@ class TextParser(TextBasedParser):
     
     def _analyze_javascript_features(self, content: str) -> Dict[str, Any]:
         """分析 JavaScript/TypeScript 特定功能。"""
-        import re
-        
         # 计算函数定义
-        function_count = len(re.findall(r'function\s+\w+\s*\(', content))
-        arrow_function_count = len(re.findall(r'\w+\s*=\s*\([^)]*\)\s*=>', content))
+        function_count = len(_JS_FUNCTION_RE.findall(content))
+        arrow_function_count = len(_JS_ARROW_FUNCTION_RE.findall(content))
         
         # 计算导入/需要语句
-        import_count = len(re.findall(r'^(?:import|const\s+\w+\s*=\s*require)', content, re.MULTILINE))
+        import_count = len(_JS_IMPORT_RE.findall(content))
         
         # 计算注释
-        single_comment_count = len(re.findall(r'//.*$', content, re.MULTILINE))
-        multi_comment_count = len(re.findall(r'/\*.*?\*/', content, re.DOTALL))
+        single_comment_count = len(_LINE_COMMENT_RE.findall(content)) if '//' in content else 0
+        multi_comment_count = len(_BLOCK_COMMENT_RE.findall(content)) if '/*' in content else 0
         
         return {
             "functions": function_count,
@@ -344,18 +537,16 @@ class TextParser(TextBasedParser):
     
     def _analyze_c_like_features(self, content: str) -> Dict[str, Any]:
         """分析类 C 语言功能。"""
-        import re
-        
         # 计算函数定义 (简化)
-        function_count = len(re.findall(r'\w+\s+\w+\s*\([^)]*\)\s*{', content))
+        function_count = len(_C_FUNCTION_RE.findall(content))
         
         # 计算包含语句
-        include_count = len(re.findall(r'^#include\s*<[^>]+>', content, re.MULTILINE))
-        include_count += len(re.findall(r'^#include\s*"[^"]+"', content, re.MULTILINE))
+        include_count = len(_C_INCLUDE_SYSTEM_RE.findall(content))
+        include_count += len(_C_INCLUDE_LOCAL_RE.findall(content))
         
         # 计算注释
-        single_comment_count = len(re.findall(r'//.*$', content, re.MULTILINE))
-        multi_comment_count = len(re.findall(r'/\*.*?\*/', content, re.DOTALL))
+        single_comment_count = len(_LINE_COMMENT_RE.findall(content)) if '//' in content else 0
+        multi_comment_count = len(_BLOCK_COMMENT_RE.findall(content)) if '/*' in content else 0
         
         return {
             "functions": function_count,
@@ -366,20 +557,22 @@ class TextParser(TextBasedParser):
     
     def _analyze_json_features(self, content: str) -> Dict[str, Any]:
         """分析 JSON 特定功能。"""
-        import json
-        
         try:
-            data = json.loads(content)
+            data = self._load_json(content)
             
-            def count_items(obj):
+            # 用显式栈遍历，避免递归的栈帧开销和深层嵌套时超出递归限制
+            total_items = 0
+            stack = [data]
+            while stack:
+                obj = stack.pop()
                 if isinstance(obj, dict):
-                    return len(obj) + sum(count_items(v) for v in obj.values())
+                    total_items += len(obj)
+                    stack.extend(obj.values())
                 elif isinstance(obj, list):
-                    return len(obj) + sum(count_items(item) for item in obj)
+                    total_items += len(obj)
+                    stack.extend(obj)
                 else:
-                    return 1
-            
-            total_items = count_items(data)
+                    total_items += 1
             
             return {
                 "valid_json": True,
@@ -392,18 +585,26 @@ class TextParser(TextBasedParser):
                 "error": "无效的 JSON 格式"
             }
     
+    def _load_json(self, content: str) -> Any:
+        """解析 JSON 文本，安装了 orjson 时优先使用。"""
+        if orjson is not None:
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # orjson 不接受 NaN/Infinity 和超出 64 位的整数，交给标准库再试一次
+                pass
+        return json.loads(content)
+    
     def _analyze_yaml_features(self, content: str) -> Dict[str, Any]:
         """分析 YAML 特定功能。"""
-        import re
-        
         # 计算键值对 (简化)
-        kv_pairs = len(re.findall(r'^\s*\w+\s*:', content, re.MULTILINE))
+        kv_pairs = len(_YAML_KEY_VALUE_RE.findall(content))
         
         # 计算列表项
-        list_items = len(re.findall(r'^\s*-\s+', content, re.MULTILINE))
+        list_items = len(_YAML_LIST_ITEM_RE.findall(content))
         
         # 计算注释
-        comments = len(re.findall(r'#.*$', content, re.MULTILINE))
+        comments = len(_HASH_COMMENT_RE.findall(content)) if '#' in content else 0
         
         return {
             "key_value_pairs": kv_pairs,
@@ -413,17 +614,22 @@ class TextParser(TextBasedParser):
     
     def _analyze_csv_features(self, content: str) -> Dict[str, Any]:
         """分析 CSV 特定功能。"""
-        lines = content.split('\n')
-        non_empty_lines = [line for line in lines if line.strip()]
-        
-        if not non_empty_lines:
+        # 非空行直接在字符串上计数，不构建行列表
+        first_match = _NONEMPTY_LINE_RE.search(content)
+        if first_match is None:
             return {"rows": 0, "columns": 0}
         
-        # 估算分隔符
-        first_line = non_empty_lines[0]
-        comma_count = first_line.count(',')
-        semicolon_count = first_line.count(';')
-        tab_count = first_line.count('\t')
+        row_count = len(_NONEMPTY_LINE_RE.findall(content, first_match.start()))
+        
+        line_start = first_match.start()
+        line_end = content.find('\n', line_start)
+        first_line = content[line_start:] if line_end == -1 else content[line_start:line_end]
+        
+        # 估算分隔符：统计开头多行（约 8 KiB）中的候选分隔符，比只看首行更可靠
+        sample = content[line_start:line_start + CSV_DELIMITER_SAMPLE_CHARS]
+        comma_count = sample.count(',')
+        semicolon_count = sample.count(';')
+        tab_count = sample.count('\t')
         
         delimiter = ','
         if semicolon_count > comma_count and semicolon_count > tab_count:
@@ -435,54 +641,34 @@ class TextParser(TextBasedParser):
         columns = len(first_line.split(delimiter))
         
         return {
-            "rows": len(non_empty_lines),
+            "rows": row_count,
             "columns": columns,
             "estimated_delimiter": delimiter
         }
     
     def _analyze_log_features(self, content: str) -> Dict[str, Any]:
         """分析日志文件功能。"""
-        import re
-        
-        lines = content.split('\n')
-        
-        # 计算不同日志级别
-        error_count = len(re.findall(r'\b(?:ERROR|ERR)\b', content, re.IGNORECASE))
-        warning_count = len(re.findall(r'\b(?:WARNING|WARN)\b', content, re.IGNORECASE))
-        info_count = len(re.findall(r'\b(?:INFO|INF)\b', content, re.IGNORECASE))
-        debug_count = len(re.findall(r'\b(?:DEBUG|DBG)\b', content, re.IGNORECASE))
-        
-        # 尝试检测时间戳模式
-        timestamp_patterns = [
-            r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-            r'\d{2}/\d{2}/\d{4}',  # MM/DD/YYYY
-            r'\d{2}:\d{2}:\d{2}',  # HH:MM:SS
-        ]
-        
-        timestamps = 0
-        for pattern in timestamp_patterns:
-            timestamps += len(re.findall(pattern, content))
+        # 一次扫描同时统计各日志级别和时间戳，按匹配到的分组名计数
+        counts = Counter(match.lastgroup for match in _LOG_FEATURE_RE.finditer(content))
         
         return {
-            "error_count": error_count,
-            "warning_count": warning_count,
-            "info_count": info_count,
-            "debug_count": debug_count,
-            "timestamp_count": timestamps
+            "error_count": counts["error"],
+            "warning_count": counts["warning"],
+            "info_count": counts["info"],
+            "debug_count": counts["debug"],
+            "timestamp_count": counts["timestamp"]
         }
     
     def _analyze_generic_features(self, content: str) -> Dict[str, Any]:
         """分析通用文本功能。"""
-        import re
+        # 计算 URL（不含 "http" 时不可能匹配，跳过正则扫描）
+        url_count = len(_URL_RE.findall(content)) if 'http' in content else 0
         
-        # 计算 URL
-        url_count = len(re.findall(r'https?://[^\s]+', content))
-        
-        # 计算电子邮件地址
-        email_count = len(re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', content))
+        # 计算电子邮件地址（邮件模式对每个单词都会回溯，没有 "@" 时直接跳过）
+        email_count = len(_EMAIL_RE.findall(content)) if '@' in content else 0
         
         # 计算数字
-        number_count = len(re.findall(r'\b\d+\.?\d*\b', content))
+        number_count = len(_NUMBER_RE.findall(content))
         
         return {
             "urls": url_count,
@@ -503,6 +689,11 @@ class TextParser(TextBasedParser):
         引发:
             ParsingError: 如果提取失败
         """
+        # 结构化内容只需元数据：缓存中已有语言特征时直接返回，不必读取和分析文件
+        cached_metadata = self._get_cached_metadata(file_path)
+        if cached_metadata is not None:
+            return cached_metadata
+        
         parse_result = self.parse(file_path)
         
         if not parse_result.success:
@@ -513,6 +704,47 @@ class TextParser(TextBasedParser):
         
         return parse_result.metadata or {}
     
+    def _get_cached_metadata(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        获取缓存中包含语言特征的元数据。
+        
+        与 parse 的缓存路径不同，这里不要求缓存了解析内容，
+        因此超过内容缓存大小限制的文件同样可以命中。
+        
+        参数:
+            file_path: 文本文件路径
+            
+        返回:
+            元数据字典；缓存不可用、已过期或缺少语言特征时返回 None
+        """
+        if not self.cache_aware:
+            return None
+        
+        try:
+            from ..indexing.cache import is_file_indexed_and_current, file_index_cache
+            
+            if not is_file_indexed_and_current(file_path):
+                return None
+            
+            cached_info = file_index_cache.get_cached_file_info(file_path)
+            metadata = (cached_info or {}).get("metadata") or {}
+            if "language_features" not in metadata:
+                return None
+            
+            logger.info(f"使用文本元数据缓存: {file_path}")
+            return {
+                "from_cache": True,
+                "cached_at": cached_info.get("indexed_at"),
+                **metadata
+            }
+            
+        except ImportError:
+            logger.debug("缓存模块不可用，执行常规文本解析")
+        except Exception as e:
+            logger.warning(f"文本元数据缓存检查失败: {e}，执行常规解析")
+        
+        return None
+    
     def combine_structured_content(self, structured_content: Dict[str, Any]) -> str:
         """
         对于文本文件，内容已处于最佳格式。
@@ -8,8 +8,10 @@ MCP 服务器路径验证和安全工具
 import os
 import re
 import logging
-from typing import List, Optional
-from pathlib import Path
+import urllib.parse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 from ..config import config
 from ..exceptions import (
@@ -20,6 +22,12 @@ from ..exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# 批量验证：路径数达到该值时使用线程池（stat/realpath 期间释放 GIL，可重叠系统调用等待）
+BATCH_VALIDATION_MIN_PATHS = 8
+BATCH_VALIDATION_MAX_WORKERS = (os.cpu_count() or 1) * 4
+# 批量验证时同一目录下的路径数达到该值时，一次列出目录代替逐个 stat
+BATCH_SCANDIR_MIN_SIBLINGS = 16
+
 
 class PathValidator:
     """
@@ -35,10 +43,9 @@ class PathValidator:
         参数:
             allowed_directories: 允许的目录路径列表
         """
-        self.allowed_directories = allowed_directories or config.security.ALLOWED_DIRS
-        self.normalized_allowed_dirs = [
-            os.path.normpath(os.path.abspath(d)) for d in self.allowed_directories
-        ]
+        # 允许目录配置的版本号，每次设置允许目录时递增；调用方据此使缓存的检查结果失效
+        self.version = 0
+        self.set_allowed_directories(allowed_directories or config.security.ALLOWED_DIRS)
         
         # 应该被阻止的危险路径组件
         self.dangerous_components = {
@@ -90,7 +97,17 @@ class PathValidator:
             r'[\x00-\x1f\x7f-\x9f]' # 控制字符
         ]
         
-        self.compiled_patterns = [re.compile(pattern) for pattern in self.suspicious_patterns]
+        # 危险组件和可疑模式合并为一个正则，按命名分组区分，一次扫描完成两类检查。
+        # 危险组件按 ASCII 忽略大小写匹配（与对路径 lower() 后比较等价），长的组件在前，
+        # 优先报告更具体的组件
+        dangerous_alternation = '|'.join(
+            re.escape(component)
+            for component in sorted(self.dangerous_components, key=len, reverse=True)
+        )
+        self._path_scan_re = re.compile('|'.join(
+            [f'(?P<component>(?ai:{dangerous_alternation}))'] +
+            [f'(?P<pattern{i}>{pattern})' for i, pattern in enumerate(self.suspicious_patterns)]
+        ))
     
     def validate_path(self, path: str, check_existence: bool = True) -> str:
         """
@@ -111,11 +128,8 @@ class PathValidator:
         if not path or not isinstance(path, str):
             raise SecurityError("无效路径: 路径必须是非空字符串")
         
-        # 检查危险组件
-        self._check_dangerous_components(path)
-        
-        # 检查可疑模式
-        self._check_suspicious_patterns(path)
+        # 检查危险组件和可疑模式
+        self._check_path_patterns(path)
         
         # 规范化路径
         normalized_path = self._normalize_path(path)
@@ -152,15 +166,9 @@ class PathValidator:
             # 移除任何 URL 编码
             path = self._decode_url_encoding(path)
             
-            # 转换为绝对路径并规范化
-            abs_path = os.path.abspath(path)
-            normalized = os.path.normpath(abs_path)
-            
-            # 使用 pathlib 进行额外规范化
-            pathlib_path = Path(normalized)
-            resolved = pathlib_path.resolve()
-            
-            return str(resolved)
+            # 一次完成绝对化、规范化和符号链接解析（Path.resolve() 底层同样调用 realpath）。
+            # 符号链接必须解析，否则允许目录内的链接可指向目录之外
+            return os.path.realpath(path)
         except (OSError, ValueError) as e:
             raise SecurityError(f"路径规范化失败: {str(e)}")
     
@@ -174,8 +182,6 @@ class PathValidator:
         返回:
             解码后的路径
         """
-        import urllib.parse
-        
         try:
             # 仅在包含 URL 编码模式时解码
             if '%' in path:
@@ -189,41 +195,32 @@ class PathValidator:
             # 如果解码失败，返回原始路径 (更安全)
             return path
     
-    def _check_dangerous_components(self, path: str) -> None:
+    def _check_path_patterns(self, path: str) -> None:
         """
-        检查危险的路径组件。
+        一次扫描检查危险的路径组件和可疑模式。
         
         参数:
             path: 要检查的路径
             
         引发:
-            SecurityError: 如果发现危险组件
+            SecurityError: 如果发现危险组件或可疑模式
         """
-        path_lower = path.lower()
+        match = self._path_scan_re.search(path)
+        if match is None:
+            return
         
-        for dangerous in self.dangerous_components:
-            if dangerous in path_lower:
-                raise SecurityError(
-                    f"检测到危险路径组件: {dangerous}",
-                    details={"component": dangerous, "path": path}
-                )
-    
-    def _check_suspicious_patterns(self, path: str) -> None:
-        """
-        检查路径中的可疑模式。
+        if match.lastgroup == 'component':
+            dangerous = match.group().lower()
+            raise SecurityError(
+                f"检测到危险路径组件: {dangerous}",
+                details={"component": dangerous, "path": path}
+            )
         
-        参数:
-            path: 要检查的路径
-            
-        引发:
-            SecurityError: 如果发现可疑模式
-        """
-        for pattern in self.compiled_patterns:
-            if pattern.search(path):
-                raise SecurityError(
-                    f"在路径中检测到可疑模式: {pattern.pattern}",
-                    details={"pattern": pattern.pattern, "path": path}
-                )
+        pattern = self.suspicious_patterns[int(match.lastgroup[len('pattern'):])]
+        raise SecurityError(
+            f"在路径中检测到可疑模式: {pattern}",
+            details={"pattern": pattern, "path": path}
+        )
     
     def _check_path_traversal(self, normalized_path: str, original_path: str) -> None:
         """
@@ -251,18 +248,30 @@ class PathValidator:
                 raise PathTraversalError(original_path)
         
         # 检查规范化路径是否在任何允许的目录之外
-        is_within_allowed = False
-        for allowed_dir in self.normalized_allowed_dirs:
-            if normalized_path.startswith(allowed_dir):
-                is_within_allowed = True
-                break
-        
-        if not is_within_allowed:
+        if not self._is_within_allowed(normalized_path):
             # 额外检查: 查看原始路径是否试图逃逸
-            for allowed_dir in self.normalized_allowed_dirs:
-                if original_path.startswith(allowed_dir):
-                    # 原始路径在允许目录内但规范化后不在 - 遍历尝试
-                    raise PathTraversalError(original_path)
+            if self._is_within_allowed(original_path):
+                # 原始路径在允许目录内但规范化后不在 - 遍历尝试
+                raise PathTraversalError(original_path)
+    
+    def set_allowed_directories(self, allowed_directories: List[str]) -> None:
+        """
+        设置允许的目录，并递增配置版本号。
+        
+        参数:
+            allowed_directories: 允许的目录路径列表
+        """
+        normalized_allowed_dirs = [
+            os.path.normpath(os.path.abspath(d)) for d in allowed_directories
+        ]
+        self.allowed_directories = allowed_directories
+        self.normalized_allowed_dirs = normalized_allowed_dirs
+        # 带分隔符的目录前缀元组：一次 startswith 匹配所有允许目录，且 /home/fo 不会匹配 /home/foo
+        self._allowed_dir_set = frozenset(normalized_allowed_dirs)
+        self._allowed_prefixes = tuple(
+            d.rstrip(os.sep) + os.sep for d in normalized_allowed_dirs
+        )
+        self.version += 1
     
     def _check_allowed_directories(self, path: str) -> None:
         """
@@ -274,15 +283,26 @@ class PathValidator:
         引发:
             FileAccessDeniedError: 如果路径不在允许的目录内
         """
-        for allowed_dir in self.normalized_allowed_dirs:
-            if path.startswith(allowed_dir):
-                return
+        if self._is_within_allowed(path):
+            return
         
         raise FileAccessDeniedError(
             file_path=path,
             allowed_directories=self.allowed_directories
         )
     
+    def _is_within_allowed(self, path: str) -> bool:
+        """
+        检查路径是否为允许的目录或位于其下。
+        
+        参数:
+            path: 要检查的路径
+            
+        返回:
+            如果在允许的目录内则返回 True，否则返回 False
+        """
+        return path.startswith(self._allowed_prefixes) or path in self._allowed_dir_set
+    
     def _check_file_extension(self, path: str) -> None:
         """
         检查文件扩展名是否被允许。
@@ -363,11 +383,7 @@ class PathValidator:
             normalized_dir = self._normalize_path(directory)
             
             # 检查是否在允许的目录内
-            for allowed_dir in self.normalized_allowed_dirs:
-                if normalized_dir.startswith(allowed_dir):
-                    return True
-            
-            return False
+            return self._is_within_allowed(normalized_dir)
         except Exception:
             return False
     
@@ -403,17 +419,98 @@ class PathValidator:
         返回:
             验证后的路径列表
         """
-        safe_paths = []
+        # 第一步：安全检查和规范化，暂不检查存在性
+        if len(paths) < BATCH_VALIDATION_MIN_PATHS:
+            validated = list(map(self._validate_or_none, paths))
+        else:
+            workers = min(BATCH_VALIDATION_MAX_WORKERS, len(paths))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # map 保持输入顺序
+                validated = list(executor.map(self._validate_or_none, paths))
+        
+        # 第二步：按所在目录批量检查存在性
+        existing = self._check_batch_existence(
+            [path for path in validated if path is not None]
+        )
         
-        for path in paths:
-            try:
-                validated_path = self.validate_path(path)
-                safe_paths.append(validated_path)
-            except Exception as e:
-                logger.warning(f"路径验证失败 {path}: {str(e)}")
+        safe_paths = []
+        for path, validated_path in zip(paths, validated):
+            if validated_path is None:
+                continue
+            if not existing[validated_path]:
+                error = FileAccessDeniedError(
+                    file_path=validated_path,
+                    allowed_directories=self.allowed_directories
+                )
+                logger.warning(f"路径验证失败 {path}: {str(error)}")
                 continue
+            safe_paths.append(validated_path)
         
         return safe_paths
+    
+    def _validate_or_none(self, path: str) -> Optional[str]:
+        """验证单个路径（不检查存在性），失败时记录警告并返回 None。"""
+        try:
+            return self.validate_path(path, check_existence=False)
+        except Exception as e:
+            logger.warning(f"路径验证失败 {path}: {str(e)}")
+            return None
+    
+    def _check_batch_existence(self, paths: List[str]) -> Dict[str, bool]:
+        """
+        批量检查规范化路径是否存在。
+        
+        同一目录下的路径足够多时，用一次 os.scandir 列出目录代替逐个 stat；
+        其余路径仍使用 os.path.exists。
+        
+        参数:
+            paths: 规范化后的路径列表
+            
+        返回:
+            路径到是否存在的字典
+        """
+        by_parent = defaultdict(list)
+        for path in paths:
+            by_parent[os.path.dirname(path)].append(path)
+        
+        existing = {}
+        for parent, siblings in by_parent.items():
+            entries = None
+            if len(siblings) >= BATCH_SCANDIR_MIN_SIBLINGS:
+                entries = self._list_directory(parent)
+            
+            for path in siblings:
+                if entries is None:
+                    existing[path] = os.path.exists(path)
+                    continue
+                
+                is_symlink = entries.get(os.path.basename(path))
+                if is_symlink is None or is_symlink:
+                    # 目录项中按名称精确匹配不到时，可能是大小写不敏感文件系统上的不同大小写写法，
+                    # 与单路径分支一样由 os.path.exists 判定；
+                    # 悬空链接在 realpath 后保持原样，也需要跟随链接确认目标存在
+                    existing[path] = os.path.exists(path)
+                else:
+                    existing[path] = True
+        
+        return existing
+    
+    def _list_directory(self, directory: str) -> Optional[Dict[str, bool]]:
+        """
+        列出目录项。
+        
+        参数:
+            directory: 目录路径
+            
+        返回:
+            目录项名称到是否为符号链接的字典；无法列出时返回 None
+        """
+        try:
+            with os.scandir(directory) as it:
+                # is_symlink 使用 getdents 返回的类型信息，通常不需要额外系统调用
+                return {entry.name: entry.is_symlink() for entry in it}
+        except OSError:
+            return None
 
 
 # 全局路径验证器实例
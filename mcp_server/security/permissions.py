@@ -5,11 +5,19 @@ MCP 服务器权限控制和访问管理
 """
 
 import os
+import re
+import time
+import heapq
+import queue
 import logging
-from typing import Dict, List, Set, Optional, Any
+import functools
+import itertools
+import threading
+from collections import deque
+from typing import Deque, Dict, FrozenSet, List, Set, Optional, Any, Tuple
 from enum import Enum
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import datetime
 
 from ..config import config
 from ..exceptions import PermissionDeniedError
@@ -17,6 +25,38 @@ from .path_validator import path_validator
 
 logger = logging.getLogger(__name__)
 
+# 速率限制的时间窗口（秒）：令牌桶在该时间内从空补满
+RATE_LIMIT_WINDOW_SECONDS = 60.0
+# 清理空闲令牌桶的间隔（秒）；空闲超过一个窗口的桶已补满，删除后与新建等价
+RATE_LIMIT_SWEEP_INTERVAL = 60.0
+# 令牌桶表的分片数，每个分片一把锁，降低并发请求间的锁竞争
+RATE_LIMIT_SHARDS = 16
+
+# 访问日志保留的最大条目数，超出后自动淘汰最旧的条目
+ACCESS_LOG_MAX_ENTRIES = 1000
+
+# 资源 stat 结果的缓存有效期（秒）及最大条目数；同一突发请求内的重复检查不再重复 stat
+STAT_CACHE_TTL_SECONDS = 1.0
+STAT_CACHE_MAX_ENTRIES = 1024
+
+# 维护窗口检查使用的当前小时的缓存时长（秒）
+HOUR_CACHE_SECONDS = 60.0
+
+# 路径安全检查结果的 LRU 缓存大小
+PATH_SAFETY_CACHE_SIZE = 4096
+
+# 审计线程每批最多处理的事件数
+AUDIT_BATCH_SIZE = 256
+# 读取访问日志时等待审计线程处理完已投递事件的最长时间（秒）
+AUDIT_FLUSH_TIMEOUT = 1.0
+
+# 各检查未通过时访问日志中记录的拒绝原因
+_ROLE_DENIED_REASON = "角色权限不足"
+_RATE_LIMITED_REASON = "超出速率限制"
+_RESOURCE_DENIED_REASON = "资源访问规则不允许"
+_SESSION_DENIED_REASON = "会话权限不足"
+_CONDITIONS_DENIED_REASON = "附加条件不满足"
+
 
 class Permission(Enum):
     """系统中可用的权限。"""
@@ -57,7 +97,51 @@ class AccessLevel(Enum):
     ADMIN = "admin"          # 完整的管理访问
 
 
-@dataclass
+# 权限检查使用的常量集合（模块级 frozenset，避免每次调用重新构造列表/集合）
+_SYSTEM_EXTS = frozenset({'.sys', '.dll', '.exe', '.bat', '.cmd'})
+_FILE_PERMS = frozenset({Permission.READ_FILE, Permission.WRITE_FILE, Permission.DELETE_FILE})
+_FILE_MODIFY_PERMS = frozenset({Permission.WRITE_FILE, Permission.DELETE_FILE})
+_DIR_PERMS = frozenset({Permission.LIST_DIRECTORY, Permission.CREATE_DIRECTORY})
+_FILE_OR_DIR_PERMS = _FILE_PERMS | _DIR_PERMS
+_INDEX_PERMS = frozenset({Permission.BUILD_INDEX, Permission.DELETE_INDEX})
+_INDEX_BUILD_LEVELS = frozenset({AccessLevel.USER, AccessLevel.POWER_USER, AccessLevel.ADMIN})
+_INDEX_DELETE_LEVELS = frozenset({AccessLevel.POWER_USER, AccessLevel.ADMIN})
+
+
+@functools.lru_cache(maxsize=PATH_SAFETY_CACHE_SIZE)
+def _cached_path_safety(path: str, ino: int, mtime_ns: int, version: int) -> bool:
+    """
+    检查路径是否安全且位于允许的目录中。
+    
+    ino、mtime_ns 与 version 只作为缓存键的一部分：路径被替换为其他文件或符号链接、
+    或允许的目录发生变化后，旧的检查结果不会再被命中。
+    """
+    if not path_validator.is_path_safe(path):
+        return False
+    try:
+        path_validator.validate_path(path, check_existence=False)
+    except Exception:
+        return False
+    return True
+
+
+def _path_safety(path: str) -> bool:
+    """检查路径是否安全且位于允许的目录中（按路径、lstat 身份和允许目录版本缓存）。"""
+    try:
+        st = os.lstat(path)
+    except (OSError, ValueError):
+        # 路径不存在或无法 stat：没有可作为缓存键的身份，中间目录可能随时被替换为符号链接，
+        # 因此每次都直接检查，不缓存结果
+        return _cached_path_safety.__wrapped__(path, 0, 0, path_validator.version)
+    return _cached_path_safety(path, st.st_ino, st.st_mtime_ns, path_validator.version)
+
+
+def clear_path_safety_cache() -> None:
+    """清空路径安全检查缓存（允许的目录变化时已自动失效，此处用于主动释放）。"""
+    _cached_path_safety.cache_clear()
+
+
+@dataclass(slots=True)
 class AccessRule:
     """表示访问控制规则。"""
     
@@ -66,9 +150,13 @@ class AccessRule:
     conditions: Optional[Dict[str, Any]] = None  # 附加条件
     expires_at: Optional[datetime] = None  # 过期时间
     description: Optional[str] = None
+    # 添加规则时编译的资源模式，匹配时直接调用 search()
+    compiled_pattern: Optional[re.Pattern] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
-@dataclass
+@dataclass(slots=True)
 class AccessRequest:
     """表示对资源的访问请求。"""
     
@@ -77,11 +165,7 @@ class AccessRequest:
     user_id: Optional[str] = None
     session_id: Optional[str] = None
     client_info: Optional[Dict[str, Any]] = None
-    timestamp: datetime = None
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
+    timestamp: datetime = field(default_factory=datetime.now)
 
 
 class PermissionManager:
@@ -93,30 +177,60 @@ class PermissionManager:
     
     def __init__(self):
         """初始化权限管理器。"""
-        self.access_rules: Dict[str, List[AccessRule]] = {}
-        self.role_permissions: Dict[AccessLevel, Set[Permission]] = {}
+        # 规则与角色表采用写时复制：写操作在 _write_lock 下构建新对象后整体替换引用，
+        # 读取路径无需加锁即可看到一致的快照
+        self._write_lock = threading.Lock()
+        self.access_rules: Dict[Permission, List[AccessRule]] = {}
+        # 资源模式字符串 -> 已编译的正则，多条规则共用同一模式时只编译一次
+        self._compiled_patterns: Dict[str, re.Pattern] = {}
+        # 带过期时间的规则的最小堆 (expires_at, 序号, 规则)，清理时只需弹出已过期的堆顶
+        self._rule_expiry: List[Tuple[datetime, int, AccessRule]] = []
+        self._rule_expiry_seq = itertools.count()
+        # 角色权限运行期间不变，使用不可变的 frozenset
+        self.role_permissions: Dict[AccessLevel, FrozenSet[Permission]] = {}
         self.user_roles: Dict[str, AccessLevel] = {}
         self.session_permissions: Dict[str, Set[Permission]] = {}
-        self.access_log: List[Dict[str, Any]] = []
+        self.access_log: Deque[Dict[str, Any]] = deque(maxlen=ACCESS_LOG_MAX_ENTRIES)
+        
+        # 审计事件以元组形式入队，由后台线程构建日志条目（含 isoformat 转换），不占用请求路径
+        self._audit_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._audit_lock = threading.Lock()
+        self._audit_thread = threading.Thread(
+            target=self._audit_worker, name="permission-audit", daemon=True
+        )
+        self._audit_thread.start()
         
         # 初始化默认角色权限
         self._initialize_default_roles()
-        
-        # 速率限制
-        self.rate_limits: Dict[str, List[datetime]] = {}
+        # (访问级别, 权限) 组合的扁平集合，角色检查只需一次哈希查找；修改 role_permissions 后需重建
+        self._role_perm_set: Set[Tuple[AccessLevel, Permission]] = set()
+        self._rebuild_role_perm_set()
+        
+        # 速率限制：每个键一个令牌桶 [剩余令牌数, 上次补充时间（time.monotonic 秒）]，
+        # 按键的哈希分片，每个分片由各自的锁保护
+        self.rate_limits: List[Dict[str, List[float]]] = [{} for _ in range(RATE_LIMIT_SHARDS)]
+        self._rate_limit_locks = [threading.Lock() for _ in range(RATE_LIMIT_SHARDS)]
+        self._last_rate_limit_sweep = time.monotonic()
         self.max_requests_per_minute = 60
+        
+        # 资源路径 -> (缓存时间, 是否存在, 大小, 小写扩展名)
+        self._stat_cache: Dict[str, Tuple[float, bool, int, str]] = {}
+        
+        # 当前小时及其缓存时间（time.monotonic 秒），避免每次检查都构造 datetime
+        self._hour_cache = datetime.now().hour
+        self._hour_cache_ts = time.monotonic()
     
     def _initialize_default_roles(self) -> None:
         """初始化默认角色权限。"""
         
         # 访客权限 (只读)
-        self.role_permissions[AccessLevel.GUEST] = {
+        self.role_permissions[AccessLevel.GUEST] = frozenset({
             Permission.READ_FILE,
             Permission.LIST_DIRECTORY,
             Permission.PARSE_DOCUMENT,
             Permission.SEARCH_INDEX,
             Permission.GET_SYSTEM_INFO
-        }
+        })
         
         # 用户权限 (标准操作)
         self.role_permissions[AccessLevel.USER] = (
@@ -138,7 +252,7 @@ class PermissionManager:
         )
         
         # 管理员权限 (所有权限)
-        self.role_permissions[AccessLevel.ADMIN] = set(Permission)
+        self.role_permissions[AccessLevel.ADMIN] = frozenset(Permission)
     
     def check_permission(
         self, 
@@ -155,28 +269,31 @@ class PermissionManager:
         返回:
             如果授予权限则返回 True，否则返回 False
         """
+        # 每次检查只在结束时记录一条带最终状态的审计日志
         try:
-            # 记录访问尝试
-            self._log_access_attempt(request, access_level)
+            # 先检查基本角色权限（一次集合查找）：注定被拒绝的请求不消耗速率配额
+            if not self._check_role_permission(request.permission, access_level):
+                self._audit(request, access_level, "denied", _ROLE_DENIED_REASON)
+                return False
             
             # 检查速率限制
             if not self._check_rate_limit(request):
-                return False
-            
-            # 检查基本角色权限
-            if not self._check_role_permission(request.permission, access_level):
+                self._audit(request, access_level, "denied", _RATE_LIMITED_REASON)
                 return False
             
             # 检查资源特定规则
             if not self._check_resource_access(request, access_level):
+                self._audit(request, access_level, "denied", _RESOURCE_DENIED_REASON)
                 return False
             
             # 检查会话特定权限
             if request.session_id and not self._check_session_permission(request):
+                self._audit(request, access_level, "denied", _SESSION_DENIED_REASON)
                 return False
             
             # 检查附加条件
             if not self._check_additional_conditions(request, access_level):
+                self._audit(request, access_level, "denied", _CONDITIONS_DENIED_REASON)
                 return False
             
             # 所有检查通过
@@ -184,7 +301,7 @@ class PermissionManager:
             return True
             
         except Exception as e:
-            logger.error(f"权限检查失败: {str(e)}")
+            logger.error("权限检查失败: %s", e)
             self._log_access_denied(request, access_level, str(e))
             return False
     
@@ -212,26 +329,29 @@ class PermissionManager:
     
     def _check_role_permission(self, permission: Permission, access_level: AccessLevel) -> bool:
         """检查访问级别是否具有所需权限。"""
-        allowed_permissions = self.role_permissions.get(access_level, set())
-        return permission in allowed_permissions
+        return (access_level, permission) in self._role_perm_set
+    
+    def _rebuild_role_perm_set(self) -> None:
+        """根据 role_permissions 重建 (访问级别, 权限) 查找集合。"""
+        self._role_perm_set = {
+            (level, perm)
+            for level, perms in self.role_permissions.items()
+            for perm in perms
+        }
     
     def _check_resource_access(self, request: AccessRequest, access_level: AccessLevel) -> bool:
         """检查资源特定的访问规则。"""
         
         # 文件系统访问检查
-        if request.resource and request.permission in [
-            Permission.READ_FILE, Permission.WRITE_FILE, Permission.DELETE_FILE
-        ]:
+        if request.resource and request.permission in _FILE_PERMS:
             return self._check_file_access(request.resource, request.permission, access_level)
         
         # 目录访问检查
-        if request.resource and request.permission in [
-            Permission.LIST_DIRECTORY, Permission.CREATE_DIRECTORY
-        ]:
+        if request.resource and request.permission in _DIR_PERMS:
             return self._check_directory_access(request.resource, request.permission, access_level)
         
         # 索引访问检查
-        if request.permission in [Permission.BUILD_INDEX, Permission.DELETE_INDEX]:
+        if request.permission in _INDEX_PERMS:
             return self._check_index_access(request, access_level)
         
         return True
@@ -239,27 +359,20 @@ class PermissionManager:
     def _check_file_access(self, file_path: str, permission: Permission, access_level: AccessLevel) -> bool:
         """检查文件特定的访问权限。"""
         
-        # 验证路径安全
-        if not path_validator.is_path_safe(file_path):
-            return False
-        
-        # 检查文件是否在允许的目录中
-        try:
-            path_validator.validate_path(file_path, check_existence=False)
-        except Exception:
+        # 验证路径安全，并检查文件是否在允许的目录中
+        if not _path_safety(file_path):
             return False
         
         # 基于扩展名的附加文件特定规则
-        file_ext = os.path.splitext(file_path)[1].lower()
+        file_ext = self._stat(file_path)[2]
         
         # 限制某些文件类型的写入/删除操作
-        if permission in [Permission.WRITE_FILE, Permission.DELETE_FILE]:
+        if permission in _FILE_MODIFY_PERMS:
             if access_level == AccessLevel.GUEST:
                 return False
             
             # 系统文件应仅由管理员访问
-            system_extensions = {'.sys', '.dll', '.exe', '.bat', '.cmd'}
-            if file_ext in system_extensions and access_level != AccessLevel.ADMIN:
+            if file_ext in _SYSTEM_EXTS and access_level != AccessLevel.ADMIN:
                 return False
         
         return True
@@ -284,11 +397,11 @@ class PermissionManager:
         if request.permission == Permission.BUILD_INDEX:
             # 检查是否有正在进行的构建
             # 这是更复杂逻辑的占位符
-            return access_level in [AccessLevel.USER, AccessLevel.POWER_USER, AccessLevel.ADMIN]
+            return access_level in _INDEX_BUILD_LEVELS
         
         # 删除索引是一项破坏性操作
         if request.permission == Permission.DELETE_INDEX:
-            return access_level in [AccessLevel.POWER_USER, AccessLevel.ADMIN]
+            return access_level in _INDEX_DELETE_LEVELS
         
         return True
     
@@ -303,112 +416,237 @@ class PermissionManager:
         """检查附加条件如基于时间的限制。"""
         
         # 基于时间的限制 (示例: 维护窗口期间无管理操作)
-        current_hour = datetime.now().hour
+        current_hour = self._current_hour()
         if (access_level == AccessLevel.ADMIN and 
             request.permission == Permission.SYSTEM_ADMIN and
             2 <= current_hour <= 4):  # 维护窗口 2-4 AM
             return False
         
-        # 资源大小限制
-        if request.resource and os.path.exists(request.resource):
-            file_size = os.path.getsize(request.resource)
+        # 资源大小限制（仅文件/目录权限的资源是文件系统路径，其余如索引名无需 stat）
+        if request.resource and request.permission in _FILE_OR_DIR_PERMS:
+            exists, file_size, _ = self._stat(request.resource)
             max_size = config.security.MAX_FILE_SIZE
             
-            if file_size > max_size and access_level != AccessLevel.ADMIN:
+            if exists and file_size > max_size and access_level != AccessLevel.ADMIN:
                 return False
         
         return True
     
+    def _current_hour(self) -> int:
+        """返回当前小时（0-23），结果缓存 HOUR_CACHE_SECONDS 秒。"""
+        now = time.monotonic()
+        if now - self._hour_cache_ts >= HOUR_CACHE_SECONDS:
+            self._hour_cache = datetime.now().hour
+            self._hour_cache_ts = now
+        return self._hour_cache
+    
+    def _stat(self, path: str) -> Tuple[bool, int, str]:
+        """返回资源的 (是否存在, 大小, 小写扩展名)，结果缓存 STAT_CACHE_TTL_SECONDS 秒。"""
+        now = time.monotonic()
+        cached = self._stat_cache.get(path)
+        if cached is not None and now - cached[0] < STAT_CACHE_TTL_SECONDS:
+            return cached[1], cached[2], cached[3]
+        
+        # 一次 os.stat 同时得到存在性与大小（替代 exists + getsize 两次系统调用）
+        try:
+            exists, size = True, os.stat(path).st_size
+        except (OSError, ValueError):
+            exists, size = False, 0
+        ext = os.path.splitext(path)[1].lower()
+        
+        if len(self._stat_cache) >= STAT_CACHE_MAX_ENTRIES:
+            self._stat_cache.clear()
+        self._stat_cache[path] = (now, exists, size, ext)
+        return exists, size, ext
+    
     def _check_rate_limit(self, request: AccessRequest) -> bool:
         """检查请求的速率限制。"""
         
         # 使用 session_id 或 user_id 进行速率限制
         key = request.session_id or request.user_id or "anonymous"
-        now = datetime.now()
-        
-        # 清理旧条目
-        if key in self.rate_limits:
-            self.rate_limits[key] = [
-                timestamp for timestamp in self.rate_limits[key]
-                if now - timestamp < timedelta(minutes=1)
-            ]
-        else:
-            self.rate_limits[key] = []
-        
-        # 检查是否超出速率限制
-        if len(self.rate_limits[key]) >= self.max_requests_per_minute:
-            return False
-        
-        # 添加当前请求
-        self.rate_limits[key].append(now)
-        return True
+        now = time.monotonic()
+        capacity = self.max_requests_per_minute
+        
+        if now - self._last_rate_limit_sweep >= RATE_LIMIT_SWEEP_INTERVAL:
+            self._sweep_rate_limits(now)
+        
+        # 令牌桶：按经过的时间补充令牌（不超过容量），每个请求消耗一个
+        shard = hash(key) % RATE_LIMIT_SHARDS
+        buckets = self.rate_limits[shard]
+        with self._rate_limit_locks[shard]:
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = [float(capacity), now]
+            else:
+                refill_rate = capacity / RATE_LIMIT_WINDOW_SECONDS
+                bucket[0] = min(float(capacity), bucket[0] + (now - bucket[1]) * refill_rate)
+                bucket[1] = now
+            
+            # 检查是否超出速率限制
+            if bucket[0] < 1.0:
+                return False
+            
+            bucket[0] -= 1.0
+            return True
     
-    def _log_access_attempt(self, request: AccessRequest, access_level: AccessLevel) -> None:
-        """记录访问尝试。"""
-        log_entry = {
-            "timestamp": request.timestamp.isoformat(),
-            "permission": request.permission.value,
-            "resource": request.resource,
-            "access_level": access_level.value,
-            "user_id": request.user_id,
-            "session_id": request.session_id,
-            "status": "attempted"
-        }
-        self.access_log.append(log_entry)
-        
-        # 保持日志大小可管理
-        if len(self.access_log) > 1000:
-            self.access_log = self.access_log[-500:]
+    def _sweep_rate_limits(self, now: float) -> None:
+        """删除空闲超过一个时间窗口的令牌桶，避免速率限制表无限增长。"""
+        self._last_rate_limit_sweep = now
+        cutoff = now - RATE_LIMIT_WINDOW_SECONDS
+        for lock, buckets in zip(self._rate_limit_locks, self.rate_limits):
+            with lock:
+                stale = [key for key, bucket in buckets.items() if bucket[1] <= cutoff]
+                for key in stale:
+                    del buckets[key]
+    
+    def _audit(
+        self,
+        request: AccessRequest,
+        access_level: AccessLevel,
+        status: str,
+        reason: Optional[str] = None
+    ) -> None:
+        """将一次权限检查的最终结果作为元组投递给审计线程。"""
+        self._audit_queue.put((
+            request.timestamp, request.permission.value, request.resource,
+            access_level.value, request.user_id, request.session_id, status, reason
+        ))
     
     def _log_access_granted(self, request: AccessRequest, access_level: AccessLevel) -> None:
         """记录成功的访问授权。"""
-        if self.access_log:
-            self.access_log[-1]["status"] = "granted"
+        self._audit(request, access_level, "granted")
         
+        # 使用 % 风格参数，日志级别关闭时不做任何格式化
         logger.info(
-            f"访问已授予: {request.permission.value} 给 {access_level.value} "
-            f"在 {request.resource or 'system'} 上"
+            "访问已授予: %s 给 %s 在 %s 上",
+            request.permission.value, access_level.value, request.resource or "system"
         )
     
     def _log_access_denied(self, request: AccessRequest, access_level: AccessLevel, reason: str) -> None:
         """记录访问拒绝。"""
-        if self.access_log:
-            self.access_log[-1]["status"] = "denied"
-            self.access_log[-1]["reason"] = reason
+        self._audit(request, access_level, "denied", reason)
         
         logger.warning(
-            f"访问被拒绝: {request.permission.value} 给 {access_level.value} "
-            f"在 {request.resource or 'system'} 上 - {reason}"
+            "访问被拒绝: %s 给 %s 在 %s 上 - %s",
+            request.permission.value, access_level.value, request.resource or "system", reason
         )
     
+    def _audit_worker(self) -> None:
+        """后台审计线程：阻塞等待事件，每次批量处理至多 AUDIT_BATCH_SIZE 个。"""
+        while True:
+            batch = [self._audit_queue.get()]
+            while len(batch) < AUDIT_BATCH_SIZE:
+                try:
+                    batch.append(self._audit_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            with self._audit_lock:
+                for event in batch:
+                    if isinstance(event, threading.Event):
+                        # 刷新标记：其之前投递的事件均已写入日志
+                        event.set()
+                    else:
+                        self._apply_audit_event(event)
+    
+    def _flush_audit_queue(self) -> None:
+        """等待审计线程处理完此前投递的所有事件。"""
+        # 队列先进先出，标记被处理时之前的事件都已按顺序写入
+        flushed = threading.Event()
+        self._audit_queue.put(flushed)
+        flushed.wait(AUDIT_FLUSH_TIMEOUT)
+    
+    def _apply_audit_event(self, event: tuple) -> None:
+        """将单个审计事件写入访问日志。"""
+        timestamp, permission, resource, access_level, user_id, session_id, status, reason = event
+        entry = {
+            "timestamp": timestamp.isoformat(),
+            "permission": permission,
+            "resource": resource,
+            "access_level": access_level,
+            "user_id": user_id,
+            "session_id": session_id,
+            "status": status
+        }
+        if reason is not None:
+            entry["reason"] = reason
+        self.access_log.append(entry)
+    
     def add_access_rule(self, rule: AccessRule) -> None:
         """添加自定义访问规则。"""
-        permission_key = rule.permission.value
-        if permission_key not in self.access_rules:
-            self.access_rules[permission_key] = []
-        self.access_rules[permission_key].append(rule)
+        with self._write_lock:
+            # 添加时编译资源模式（无效的正则在此处即报错），检查时无需再编译
+            if rule.resource_pattern is not None:
+                compiled = self._compiled_patterns.get(rule.resource_pattern)
+                if compiled is None:
+                    compiled = re.compile(rule.resource_pattern)
+                    self._compiled_patterns[rule.resource_pattern] = compiled
+                rule.compiled_pattern = compiled
+            
+            # 直接以权限枚举为键（枚举按身份哈希，无需对字符串值求哈希）；
+            # 构建新的规则列表后替换引用，不修改读取方可能正在遍历的列表
+            permission_key = rule.permission
+            self.access_rules[permission_key] = self.access_rules.get(permission_key, []) + [rule]
+            
+            if rule.expires_at is not None:
+                heapq.heappush(self._rule_expiry, (rule.expires_at, next(self._rule_expiry_seq), rule))
     
     def set_user_role(self, user_id: str, role: AccessLevel) -> None:
         """为用户设置角色。"""
         self.user_roles[user_id] = role
     
+    def set_role_permissions(self, access_level: AccessLevel, permissions: Set[Permission]) -> None:
+        """设置访问级别拥有的权限。"""
+        with self._write_lock:
+            role_permissions = dict(self.role_permissions)
+            role_permissions[access_level] = frozenset(permissions)
+            self.role_permissions = role_permissions
+            self._rebuild_role_perm_set()
+    
     def set_session_permissions(self, session_id: str, permissions: Set[Permission]) -> None:
         """为会话设置特定权限。"""
         self.session_permissions[session_id] = permissions
     
     def get_access_log(self, limit: int = 100) -> List[Dict[str, Any]]:
         """获取最近的访问日志条目。"""
-        return self.access_log[-limit:]
+        # 先等待尚未写入的审计事件，保证调用方能看到此前所有检查的结果
+        self._flush_audit_queue()
+        with self._audit_lock:
+            return list(self.access_log)[-limit:]
     
     def clear_expired_rules(self) -> None:
         """移除过期的访问规则。"""
         now = datetime.now()
         
-        for permission_key in self.access_rules:
-            self.access_rules[permission_key] = [
-                rule for rule in self.access_rules[permission_key]
-                if rule.expires_at is None or rule.expires_at > now
-            ]
+        with self._write_lock:
+            # 从过期堆中弹出所有已过期的规则；没有过期规则时无需遍历规则列表
+            expired: Dict[Permission, Set[int]] = {}
+            while self._rule_expiry and self._rule_expiry[0][0] <= now:
+                _, _, rule = heapq.heappop(self._rule_expiry)
+                expired.setdefault(rule.permission, set()).add(id(rule))
+            if not expired:
+                return
+            
+            # 只重建包含过期规则的权限列表
+            for permission_key, expired_ids in expired.items():
+                rules = self.access_rules.get(permission_key)
+                if rules:
+                    self.access_rules[permission_key] = [
+                        rule for rule in rules if id(rule) not in expired_ids
+                    ]
+            
+            # 释放不再被任何规则使用的已编译模式
+            patterns_in_use = {
+                rule.resource_pattern
+                for rules in self.access_rules.values()
+                for rule in rules
+                if rule.resource_pattern is not None
+            }
+            self._compiled_patterns = {
+                pattern: compiled
+                for pattern, compiled in self._compiled_patterns.items()
+                if pattern in patterns_in_use
+            }
 
 
 # 全局权限管理器实例
@@ -4,6 +4,8 @@ MCP服务器主模块
 """
 
 import os
+import json
+import time
 from typing import Optional
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
@@ -30,6 +32,15 @@ load_dotenv()
 # 配置日志
 logger = setup_logger(__name__)
 
+# 健康检查响应体不变，启动时序列化一次（与 JSONResponse 的紧凑格式一致）
+_HEALTH_BODY = json.dumps(
+    {"status": "ok", "service": "mcp-server", "version": "1.0"},
+    separators=(",", ":")
+).encode("utf-8")
+
+# /status 响应体的缓存时长（秒）
+STATUS_CACHE_SECONDS = 1.0
+
 
 class MCPServer:
     """MCP服务器主类"""
@@ -60,7 +71,7 @@ class MCPServer:
             logger.info("MCP服务器初始化完成")
             
         except Exception as e:
-            logger.error(f"服务器初始化失败: {e}")
+            logger.error("服务器初始化失败: %s", e)
             raise MCPServerError(f"Failed to initialize server: {e}")
     
     def _create_starlette_app(self) -> Starlette:
@@ -70,7 +81,7 @@ class MCPServer:
         async def handle_sse(request: Request) -> Response:
             """处理SSE连接"""
             try:
-                logger.debug(f"收到来自 {request.client.host} 的SSE连接")
+                logger.debug("收到来自 %s 的SSE连接", request.client.host)
                 
                 async with sse.connect_sse(
                     request.scope,
@@ -85,30 +96,32 @@ class MCPServer:
                 
                 return Response(status_code=200)
             except Exception as e:
-                logger.error(f"SSE处理器错误: {str(e)}")
+                logger.error("SSE处理器错误: %s", e)
                 return JSONResponse({"error": "Internal server error"}, status_code=500)
         
         # 健康检查端点
         async def health_check(request: Request):
-            return JSONResponse({
-                "status": "ok", 
-                "service": "mcp-server",
-                "version": "1.0"
-            })
+            return Response(_HEALTH_BODY, media_type="application/json")
+        
+        # 获取服务器状态（响应体缓存 STATUS_CACHE_SECONDS 秒，避免频繁轮询时重复序列化）
+        status_cache = {"body": b"", "expires": 0.0}
         
-        # 获取服务器状态
         async def get_status(request: Request):
-            return JSONResponse({
-                "server": "mcp_qa_server",
-                "status": "running",
-                "initialized": self._initialized,
-                "config": {
-                    "host": config.server.HOST,
-                    "port": config.server.PORT,
-                    "debug": config.server.DEBUG,
-                    "allowed_dirs": config.security.ALLOWED_DIRS
-                }
-            })
+            now = time.monotonic()
+            if now >= status_cache["expires"]:
+                status_cache["body"] = JSONResponse({
+                    "server": "mcp_qa_server",
+                    "status": "running",
+                    "initialized": self._initialized,
+                    "config": {
+                        "host": config.server.HOST,
+                        "port": config.server.PORT,
+                        "debug": config.server.DEBUG,
+                        "allowed_dirs": config.security.ALLOWED_DIRS
+                    }
+                }).body
+                status_cache["expires"] = now + STATUS_CACHE_SECONDS
+            return Response(status_cache["body"], media_type="application/json")
         
         # 基础路由
         routes = [
@@ -146,19 +159,29 @@ class MCPServer:
     def run(self, host: Optional[str] = None, port: Optional[int] = None, 
             debug: Optional[bool] = None, **kwargs) -> None:
         """运行服务器"""
-        if not self._initialized:
-            self.initialize()
-        
         # 使用提供的参数或默认配置
         run_host = host or config.server.HOST
         run_port = port or config.server.PORT
         run_debug = debug if debug is not None else config.server.DEBUG
+        workers = kwargs.pop("workers", config.server.WORKERS)
+        
+        # 多进程模式下由每个工作进程通过 create_app 各自初始化，主进程无需构建应用
+        if workers <= 1 and not self._initialized:
+            self.initialize()
         
         logger.info(f"在 {run_host}:{run_port} 启动MCP服务器")
         
+        # loop/http 保持 uvicorn 的 "auto"：已安装 uvloop/httptools 时会自动选用
+        if workers > 1:
+            # 多进程需要以导入字符串指定应用工厂
+            app = "mcp_server.server:create_app"
+            kwargs.update(factory=True, workers=workers)
+        else:
+            app = self.app
+        
         try:
             uvicorn.run(
-                self.app,
+                app,
                 host=run_host,
                 port=run_port,
                 log_level="info" if not run_debug else "debug",
@@ -174,6 +197,13 @@ def create_server() -> MCPServer:
     return MCPServer()
 
 
+def create_app() -> Starlette:
+    """创建并初始化服务器，返回 Starlette 应用（供 uvicorn 多进程模式使用的工厂）"""
+    server = create_server()
+    server.initialize()
+    return server.app
+
+
 def run_server(host: Optional[str] = None, port: Optional[int] = None, 
                debug: Optional[bool] = None, **kwargs) -> None:
     """快速启动服务器的便捷函数"""
@@ -2,23 +2,29 @@
 MCP工具模块初始化
 """
 
-from .file_ops import *
-from .parsers import *
-from .search import *
-from .time import *
-from .cache import *
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+
+# 工具子模块及其注册函数名
+_TOOL_MODULES = (
+    ('.file_ops', 'register_file_tools'),
+    ('.parsers', 'register_parser_tools'),
+    ('.search', 'register_search_tools'),
+    ('.time', 'register_time_tools'),
+    ('.cache', 'register_cache_tools'),
+)
 
 # 工具注册函数
 def register_all_tools(mcp):
     """注册所有MCP工具"""
-    from .file_ops import register_file_tools
-    from .parsers import register_parser_tools  
-    from .search import register_search_tools
-    from .time import register_time_tools
-    from .cache import register_cache_tools
-    
-    register_file_tools(mcp)
-    register_parser_tools(mcp)
-    register_search_tools(mcp) 
-    register_time_tools(mcp)
-    register_cache_tools(mcp)
\ No newline at end of file
+    # 各子模块只在注册时导入一次，不再通过 import * 把全部公开名称拉入包命名空间；
+    # 导入在线程池中并发进行，重叠各模块（及其重量级依赖）的磁盘读取与初始化
+    with ThreadPoolExecutor(max_workers=len(_TOOL_MODULES)) as executor:
+        modules = list(executor.map(
+            lambda entry: importlib.import_module(entry[0], __name__),
+            _TOOL_MODULES
+        ))
+
+    # 注册按固定顺序串行进行，保证工具注册顺序稳定
+    for module, (_, register_name) in zip(modules, _TOOL_MODULES):
+        getattr(module, register_name)(mcp)
@@ -5,17 +5,56 @@
 
 import logging
 import os
-import json
+import re
+import fnmatch
 import pickle
+import struct
+import heapq
 import hashlib
+import tempfile
+import functools
 import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from pydantic import BaseModel
 import threading
 
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
 logger = logging.getLogger(__name__)
 
+# 内存缓存的总容量（键数）与分片数
+MEMORY_CACHE_MAXSIZE = 10000
+MEMORY_CACHE_SHARDS = 16
+# 过期时间堆的压缩阈值：堆长度超过 2 * 有效过期项数 + 该值时，从过期时间表重建堆
+TTL_HEAP_COMPACT_SLACK = 16
+
+# 已编译 glob 模式的 LRU 缓存大小
+GLOB_PATTERN_CACHE_SIZE = 128
+
+# 文件缓存键摘要的 LRU 缓存大小
+KEY_DIGEST_CACHE_SIZE = 4096
+
+# 文件缓存项的二进制头：魔数、创建时间（纳秒）、过期时间（纳秒，0 表示不过期）、键长度、pickle 数据长度
+_FILE_CACHE_HEADER = struct.Struct("<QQQQQ")
+_FILE_CACHE_MAGIC = int.from_bytes(b"MCPCACH2", "little")
+# pickle 数据之后的带外缓冲区段：缓冲区个数，随后每个缓冲区为 长度 + 原始字节
+_BUFFER_COUNT = struct.Struct("<I")
+_BUFFER_LEN = struct.Struct("<Q")
+
+
+@functools.lru_cache(maxsize=KEY_DIGEST_CACHE_SIZE)
+def _key_digest(key: str) -> str:
+    """计算缓存键的摘要，用作缓存文件名（优先 BLAKE3，否则 SHA-256）"""
+    data = key.encode()
+    if blake3 is not None:
+        return blake3(data).hexdigest()[:32]
+    return hashlib.sha256(data).hexdigest()[:32]
+
 
 class CacheSetParams(BaseModel):
     """设置缓存参数"""
@@ -54,84 +93,145 @@ class CacheStatsParams(BaseModel):
     category: Optional[str] = None
 
 
-class MemoryCache:
-    """内存缓存类"""
+@functools.lru_cache(maxsize=GLOB_PATTERN_CACHE_SIZE)
+def _glob_matcher(pattern: str):
+    """将 glob 模式编译为正则的 match 方法（按模式缓存）"""
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+class _CacheShard:
+    """内存缓存的一个分片：独立的锁、LRU 有序字典、过期时间表、分类索引与统计计数"""
+    
+    __slots__ = (
+        "lock", "data", "ttl", "ttl_heap", "categories",
+        "hits", "misses", "sets", "deletes", "evictions"
+    )
     
     def __init__(self):
+        self.lock = threading.Lock()
+        # 完整键 -> (分类, 值)
+        self.data: "OrderedDict[str, tuple]" = OrderedDict()
+        self.ttl: Dict[str, float] = {}
+        # (过期时间, 完整键) 的最小堆；键被覆盖或删除后留下的旧条目在弹出时与 ttl 比对跳过
+        self.ttl_heap: List[tuple] = []
+        # 分类 -> 该分类下的完整键（以 dict 作为有序集合），按分类操作时无需扫描全部键
+        self.categories: Dict[str, Dict[str, None]] = {}
+        # 统计计数：在已持有的分片锁内递增，由 get_stats 汇总
+        self.hits = self.misses = self.sets = self.deletes = self.evictions = 0
+    
+    def remove(self, full_key: str) -> bool:
+        """移除键及其过期时间和分类索引，返回键是否存在（调用方须持有锁）"""
+        entry = self.data.pop(full_key, None)
+        self.ttl.pop(full_key, None)
+        if entry is None:
+            return False
+        self.unindex(entry[0], full_key)
+        self.compact_ttl_heap()
+        return True
+    
+    def compact_ttl_heap(self) -> None:
+        """
+        旧条目过多时从过期时间表原地重建堆（调用方须持有锁）。
+        
+        覆盖、删除和淘汰都会在堆中留下旧条目，而堆只在 cleanup_expired 中弹出；
+        原地重建使堆大小始终与有效过期项数同阶，且不影响正在遍历堆的调用方。
+        """
+        heap = self.ttl_heap
+        if len(heap) > 2 * len(self.ttl) + TTL_HEAP_COMPACT_SLACK:
+            heap[:] = [(expire_time, key) for key, expire_time in self.ttl.items()]
+            heapq.heapify(heap)
+    
+    def unindex(self, category: str, full_key: str) -> None:
+        """从分类索引中移除键（调用方须持有锁）"""
+        keys = self.categories.get(category)
+        if keys is not None:
+            keys.pop(full_key, None)
+            if not keys:
+                del self.categories[category]
+
+
+class MemoryCache:
+    """内存缓存类（按键哈希分片，每个分片独立加锁并按 LRU 淘汰）"""
+    
+    def __init__(self, maxsize: int = MEMORY_CACHE_MAXSIZE, shards: int = MEMORY_CACHE_SHARDS):
         """初始化内存缓存"""
-        self._cache = {}
-        self._ttl_cache = {}
-        self._lock = threading.RLock()
-        self._stats = {
-            "hits": 0,
-            "misses": 0,
-            "sets": 0,
-            "deletes": 0,
-            "evictions": 0
-        }
+        self._shards = [_CacheShard() for _ in range(shards)]
+        # 每个分片的容量上限（向上取整，总容量不小于 maxsize）
+        self._shard_maxsize = max(1, -(-maxsize // shards))
+    
+    def _shard_for(self, full_key: str) -> _CacheShard:
+        """返回键所在的分片"""
+        return self._shards[(hash(full_key) & 0x7fffffff) % len(self._shards)]
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None, category: str = "default") -> bool:
         """设置缓存"""
         try:
-            with self._lock:
-                full_key = f"{category}:{key}"
-                self._cache[full_key] = value
+            full_key = f"{category}:{key}"
+            shard = self._shard_for(full_key)
+            with shard.lock:
+                shard.data[full_key] = (category, value)
+                shard.data.move_to_end(full_key)
+                shard.categories.setdefault(category, {})[full_key] = None
                 
                 if ttl:
                     expire_time = time.time() + ttl
-                    self._ttl_cache[full_key] = expire_time
-                elif full_key in self._ttl_cache:
-                    del self._ttl_cache[full_key]
+                    shard.ttl[full_key] = expire_time
+                    heapq.heappush(shard.ttl_heap, (expire_time, full_key))
+                elif full_key in shard.ttl:
+                    del shard.ttl[full_key]
                 
-                self._stats["sets"] += 1
-                return True
+                # 超出分片容量时淘汰最久未使用的键
+                while len(shard.data) > self._shard_maxsize:
+                    evicted_key, (evicted_category, _) = shard.data.popitem(last=False)
+                    shard.ttl.pop(evicted_key, None)
+                    shard.unindex(evicted_category, evicted_key)
+                    shard.evictions += 1
+                
+                shard.compact_ttl_heap()
+                shard.sets += 1
+            return True
         except Exception as e:
             logger.error(f"设置缓存失败: {e}")
             return False
     
     def get(self, key: str, category: str = "default") -> Any:
         """获取缓存"""
+        full_key = f"{category}:{key}"
+        shard = self._shard_for(full_key)
         try:
-            with self._lock:
-                full_key = f"{category}:{key}"
-                
+            with shard.lock:
                 # 检查是否过期
-                if full_key in self._ttl_cache:
-                    if time.time() > self._ttl_cache[full_key]:
-                        self._evict_key(full_key)
-                        self._stats["misses"] += 1
-                        return None
-                
-                if full_key in self._cache:
-                    self._stats["hits"] += 1
-                    return self._cache[full_key]
+                expire_time = shard.ttl.get(full_key)
+                if expire_time is not None and time.time() > expire_time:
+                    self._evict_key(shard, full_key)
+                    entry = None
                 else:
-                    self._stats["misses"] += 1
+                    entry = shard.data.get(full_key)
+                    if entry is not None:
+                        shard.data.move_to_end(full_key)
+                
+                if entry is None:
+                    shard.misses += 1
                     return None
+                shard.hits += 1
+                return entry[1]
         except Exception as e:
             logger.error(f"获取缓存失败: {e}")
-            self._stats["misses"] += 1
+            with shard.lock:
+                shard.misses += 1
             return None
     
     def delete(self, key: str, category: str = "default") -> bool:
         """删除缓存"""
         try:
-            with self._lock:
-                full_key = f"{category}:{key}"
-                deleted = False
-                
-                if full_key in self._cache:
-                    del self._cache[full_key]
-                    deleted = True
-                
-                if full_key in self._ttl_cache:
-                    del self._ttl_cache[full_key]
-                    deleted = True
-                
+            full_key = f"{category}:{key}"
+            shard = self._shard_for(full_key)
+            with shard.lock:
+                deleted = shard.remove(full_key)
                 if deleted:
-                    self._stats["deletes"] += 1
-                
-                return deleted
+                    shard.deletes += 1
+            
+            return deleted
         except Exception as e:
             logger.error(f"删除缓存失败: {e}")
             return False
@@ -139,23 +239,24 @@ class MemoryCache:
     def clear(self, category: Optional[str] = None) -> int:
         """清空缓存"""
         try:
-            with self._lock:
-                if category:
-                    prefix = f"{category}:"
-                    keys_to_delete = [k for k in self._cache.keys() if k.startswith(prefix)]
-                    count = len(keys_to_delete)
-                    
-                    for key in keys_to_delete:
-                        if key in self._cache:
-                            del self._cache[key]
-                        if key in self._ttl_cache:
-                            del self._ttl_cache[key]
-                else:
-                    count = len(self._cache)
-                    self._cache.clear()
-                    self._ttl_cache.clear()
-                
-                return count
+            count = 0
+            for shard in self._shards:
+                with shard.lock:
+                    if category:
+                        keys_to_delete = shard.categories.pop(category, {})
+                        count += len(keys_to_delete)
+                        
+                        for key in keys_to_delete:
+                            del shard.data[key]
+                            shard.ttl.pop(key, None)
+                    else:
+                        count += len(shard.data)
+                        shard.data.clear()
+                        shard.ttl.clear()
+                        shard.ttl_heap.clear()
+                        shard.categories.clear()
+            
+            return count
         except Exception as e:
             logger.error(f"清空缓存失败: {e}")
             return 0
@@ -163,19 +264,23 @@ class MemoryCache:
     def list_keys(self, category: Optional[str] = None, pattern: Optional[str] = None) -> List[str]:
         """列出缓存键"""
         try:
-            with self._lock:
-                keys = list(self._cache.keys())
-                
-                if category:
-                    prefix = f"{category}:"
-                    keys = [k for k in keys if k.startswith(prefix)]
-                    keys = [k[len(prefix):] for k in keys]  # 移除前缀
-                
-                if pattern:
-                    import fnmatch
-                    keys = [k for k in keys if fnmatch.fnmatch(k, pattern)]
-                
-                return keys
+            keys = []
+            if category:
+                prefix_len = len(category) + 1
+                for shard in self._shards:
+                    with shard.lock:
+                        # 只遍历该分类的索引，并移除 "分类:" 前缀
+                        keys.extend(k[prefix_len:] for k in shard.categories.get(category, ()))
+            else:
+                for shard in self._shards:
+                    with shard.lock:
+                        keys.extend(shard.data.keys())
+            
+            if pattern:
+                match = _glob_matcher(pattern)
+                keys = [k for k in keys if match(k)]
+            
+            return keys
         except Exception as e:
             logger.error(f"列出缓存键失败: {e}")
             return []
@@ -183,50 +288,60 @@ class MemoryCache:
     def get_stats(self, category: Optional[str] = None) -> Dict[str, Any]:
         """获取缓存统计"""
         try:
-            with self._lock:
-                stats = self._stats.copy()
-                
-                if category:
-                    prefix = f"{category}:"
-                    category_keys = [k for k in self._cache.keys() if k.startswith(prefix)]
-                    stats["category_keys"] = len(category_keys)
-                    stats["category"] = category
-                else:
-                    stats["total_keys"] = len(self._cache)
-                    stats["ttl_keys"] = len(self._ttl_cache)
-                
-                # 计算命中率
-                total_requests = stats["hits"] + stats["misses"]
-                stats["hit_rate"] = stats["hits"] / total_requests if total_requests > 0 else 0
-                
-                return stats
+            # 汇总各分片的计数，避免全局计数器成为竞争热点
+            stats = dict.fromkeys(("hits", "misses", "sets", "deletes", "evictions"), 0)
+            total_keys = ttl_keys = category_keys = 0
+            for shard in self._shards:
+                with shard.lock:
+                    stats["hits"] += shard.hits
+                    stats["misses"] += shard.misses
+                    stats["sets"] += shard.sets
+                    stats["deletes"] += shard.deletes
+                    stats["evictions"] += shard.evictions
+                    if category:
+                        category_keys += len(shard.categories.get(category, ()))
+                    else:
+                        total_keys += len(shard.data)
+                        ttl_keys += len(shard.ttl)
+            
+            if category:
+                stats["category_keys"] = category_keys
+                stats["category"] = category
+            else:
+                stats["total_keys"] = total_keys
+                stats["ttl_keys"] = ttl_keys
+            
+            # 计算命中率
+            total_requests = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / total_requests if total_requests > 0 else 0
+            
+            return stats
         except Exception as e:
             logger.error(f"获取缓存统计失败: {e}")
             return {}
     
-    def _evict_key(self, full_key: str):
-        """驱逐过期的键"""
-        if full_key in self._cache:
-            del self._cache[full_key]
-        if full_key in self._ttl_cache:
-            del self._ttl_cache[full_key]
-        self._stats["evictions"] += 1
+    def _evict_key(self, shard: _CacheShard, full_key: str):
+        """驱逐过期的键（调用方须持有分片锁）"""
+        shard.remove(full_key)
+        shard.evictions += 1
     
     def cleanup_expired(self) -> int:
         """清理过期的缓存项"""
         try:
-            with self._lock:
-                current_time = time.time()
-                expired_keys = []
-                
-                for key, expire_time in self._ttl_cache.items():
-                    if current_time > expire_time:
-                        expired_keys.append(key)
-                
-                for key in expired_keys:
-                    self._evict_key(key)
-                
-                return len(expired_keys)
+            current_time = time.time()
+            cleaned = 0
+            
+            for shard in self._shards:
+                with shard.lock:
+                    # 只弹出已到期的堆顶，未过期的项不被访问
+                    heap = shard.ttl_heap
+                    while heap and heap[0][0] < current_time:
+                        expire_time, key = heapq.heappop(heap)
+                        if shard.ttl.get(key) == expire_time:
+                            self._evict_key(shard, key)
+                            cleaned += 1
+            
+            return cleaned
         except Exception as e:
             logger.error(f"清理过期缓存失败: {e}")
             return 0
@@ -237,7 +352,12 @@ _global_cache = MemoryCache()
 
 
 class FileCache:
-    """文件缓存类"""
+    """文件缓存类
+
+    每个缓存项是单个 ``{摘要}.cache`` 文件：固定长度的二进制头
+    （魔数、创建时间、过期时间、键长度、数据长度），其后依次为 UTF-8 编码的键、pickle 数据
+    和 pickle 协议 5 的带外缓冲区（大块 bytearray、numpy 数组等直接写入，不经过 pickle 流复制）。
+    """
     
     def __init__(self, cache_dir: str = None):
         """初始化文件缓存"""
@@ -246,6 +366,12 @@ class FileCache:
         
         self.cache_dir = cache_dir
         self._ensure_cache_dir()
+        
+        # (过期时间纳秒, 键摘要) 的最小堆：清理时只检查已到期的缓存项；
+        # 首次清理时扫描目录一次构建，此后由 set 增量维护
+        self._expiry_heap: List[tuple] = []
+        self._expiry_lock = threading.Lock()
+        self._expiry_loaded = False
     
     def _ensure_cache_dir(self):
         """确保缓存目录存在"""
@@ -256,35 +382,59 @@ class FileCache:
     
     def _get_cache_path(self, key: str) -> str:
         """获取缓存文件路径"""
-        # 使用MD5哈希避免文件名过长或包含特殊字符
-        key_hash = hashlib.md5(key.encode()).hexdigest()
-        return os.path.join(self.cache_dir, f"{key_hash}.cache")
+        # 使用键的摘要避免文件名过长或包含特殊字符
+        return os.path.join(self.cache_dir, f"{_key_digest(key)}.cache")
     
-    def _get_meta_path(self, key: str) -> str:
-        """获取元数据文件路径"""
-        key_hash = hashlib.md5(key.encode()).hexdigest()
-        return os.path.join(self.cache_dir, f"{key_hash}.meta")
+    def _read_header(self, f) -> Optional[tuple]:
+        """读取并校验文件头和键，返回 (created_ns, expires_ns, key, payload_len)；格式不符时返回 None"""
+        header = f.read(_FILE_CACHE_HEADER.size)
+        if len(header) < _FILE_CACHE_HEADER.size:
+            return None
+        magic, created_ns, expires_ns, key_len, payload_len = _FILE_CACHE_HEADER.unpack(header)
+        if magic != _FILE_CACHE_MAGIC:
+            return None
+        key_bytes = f.read(key_len)
+        if len(key_bytes) < key_len:
+            return None
+        return created_ns, expires_ns, key_bytes.decode("utf-8"), payload_len
     
     def set(self, key: str, data: Any, ttl: Optional[int] = None) -> bool:
         """设置文件缓存"""
         try:
             cache_path = self._get_cache_path(key)
-            meta_path = self._get_meta_path(key)
             
-            # 保存数据
-            with open(cache_path, 'wb') as f:
-                pickle.dump(data, f)
+            buffers = []
+            payload = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+            key_bytes = key.encode("utf-8")
+            created_ns = time.time_ns()
+            expires_ns = created_ns + ttl * 1_000_000_000 if ttl else 0
+            header = _FILE_CACHE_HEADER.pack(
+                _FILE_CACHE_MAGIC, created_ns, expires_ns, len(key_bytes), len(payload)
+            )
             
-            # 保存元数据
-            meta = {
-                "key": key,
-                "created_at": time.time(),
-                "ttl": ttl,
-                "expires_at": time.time() + ttl if ttl else None
-            }
+            # 先写临时文件再原子替换，读取方不会看到写了一半的缓存项
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(header)
+                    f.write(key_bytes)
+                    f.write(payload)
+                    f.write(_BUFFER_COUNT.pack(len(buffers)))
+                    for buffer in buffers:
+                        raw = buffer.raw()
+                        f.write(_BUFFER_LEN.pack(raw.nbytes))
+                        f.write(raw)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
             
-            with open(meta_path, 'w', encoding='utf-8') as f:
-                json.dump(meta, f)
+            if expires_ns:
+                with self._expiry_lock:
+                    heapq.heappush(self._expiry_heap, (expires_ns, _key_digest(key)))
             
             return True
             
@@ -296,23 +446,47 @@ class FileCache:
         """获取文件缓存"""
         try:
             cache_path = self._get_cache_path(key)
-            meta_path = self._get_meta_path(key)
             
-            if not os.path.exists(cache_path) or not os.path.exists(meta_path):
+            # 读入可写的 bytearray，带外缓冲区重建出的对象（如 numpy 数组）保持可写
+            try:
+                with open(cache_path, 'rb') as f:
+                    buf = bytearray(os.fstat(f.fileno()).st_size)
+                    f.readinto(buf)
+            except FileNotFoundError:
                 return None
             
-            # 检查元数据
-            with open(meta_path, 'r', encoding='utf-8') as f:
-                meta = json.load(f)
+            # 解析文件头（无需 JSON 解析或额外的元数据文件）
+            if len(buf) < _FILE_CACHE_HEADER.size:
+                return None
+            magic, created_ns, expires_ns, key_len, payload_len = _FILE_CACHE_HEADER.unpack_from(buf)
+            if magic != _FILE_CACHE_MAGIC:
+                return None
             
             # 检查是否过期
-            if meta.get("expires_at") and time.time() > meta["expires_at"]:
+            if expires_ns and time.time_ns() > expires_ns:
                 self.delete(key)
                 return None
             
+            # 摘要冲突时文件中的键与请求的键不同
+            key_start = _FILE_CACHE_HEADER.size
+            payload_start = key_start + key_len
+            view = memoryview(buf)
+            if view[key_start:payload_start] != key.encode("utf-8"):
+                return None
+            
+            # 定位带外缓冲区（内存视图切片，不复制）
+            pos = payload_start + payload_len
+            (buffer_count,) = _BUFFER_COUNT.unpack_from(buf, pos)
+            pos += _BUFFER_COUNT.size
+            buffers = []
+            for _ in range(buffer_count):
+                (length,) = _BUFFER_LEN.unpack_from(buf, pos)
+                pos += _BUFFER_LEN.size
+                buffers.append(view[pos:pos + length])
+                pos += length
+            
             # 读取数据
-            with open(cache_path, 'rb') as f:
-                return pickle.load(f)
+            return pickle.loads(view[payload_start:payload_start + payload_len], buffers=buffers)
                 
         except Exception as e:
             logger.error(f"获取文件缓存失败: {e}")
@@ -321,21 +495,10 @@ class FileCache:
     def delete(self, key: str) -> bool:
         """删除文件缓存"""
         try:
-            cache_path = self._get_cache_path(key)
-            meta_path = self._get_meta_path(key)
-            
-            deleted = False
-            
-            if os.path.exists(cache_path):
-                os.remove(cache_path)
-                deleted = True
-            
-            if os.path.exists(meta_path):
-                os.remove(meta_path)
-                deleted = True
-            
-            return deleted
-            
+            os.remove(self._get_cache_path(key))
+            return True
+        except FileNotFoundError:
+            return False
         except Exception as e:
             logger.error(f"删除文件缓存失败: {e}")
             return False
@@ -344,15 +507,17 @@ class FileCache:
         """列出所有缓存键"""
         try:
             keys = []
-            for filename in os.listdir(self.cache_dir):
-                if filename.endswith('.meta'):
-                    meta_path = os.path.join(self.cache_dir, filename)
-                    try:
-                        with open(meta_path, 'r', encoding='utf-8') as f:
-                            meta = json.load(f)
-                            keys.append(meta.get("key", "unknown"))
-                    except:
-                        continue
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.cache'):
+                        try:
+                            # 只读取文件头和键，不加载缓存数据
+                            with open(entry.path, 'rb') as f:
+                                header = self._read_header(f)
+                            if header is not None:
+                                keys.append(header[2])
+                        except:
+                            continue
             return keys
         except Exception as e:
             logger.error(f"列出文件缓存键失败: {e}")
@@ -361,28 +526,52 @@ class FileCache:
     def cleanup_expired(self) -> int:
         """清理过期的文件缓存"""
         try:
-            current_time = time.time()
-            cleaned = 0
+            current_ns = time.time_ns()
             
-            for filename in os.listdir(self.cache_dir):
-                if filename.endswith('.meta'):
-                    meta_path = os.path.join(self.cache_dir, filename)
-                    try:
-                        with open(meta_path, 'r', encoding='utf-8') as f:
-                            meta = json.load(f)
-                        
-                        if meta.get("expires_at") and current_time > meta["expires_at"]:
-                            key = meta.get("key")
-                            if key and self.delete(key):
-                                cleaned += 1
-                    except:
-                        continue
+            # 从过期堆中取出已到期的键摘要（覆盖写入留下的旧条目可能重复，用集合去重）
+            with self._expiry_lock:
+                if not self._expiry_loaded:
+                    self._load_expiry_heap()
+                due = set()
+                heap = self._expiry_heap
+                while heap and heap[0][0] < current_ns:
+                    due.add(heapq.heappop(heap)[1])
+            
+            cleaned = 0
+            for digest in due:
+                cache_path = os.path.join(self.cache_dir, f"{digest}.cache")
+                try:
+                    # 以文件头中的过期时间为准：该键可能已被重新写入且尚未过期
+                    with open(cache_path, 'rb') as f:
+                        header = self._read_header(f)
+                    
+                    if header is not None and header[1] and current_ns > header[1]:
+                        os.remove(cache_path)
+                        cleaned += 1
+                except:
+                    continue
             
             return cleaned
             
         except Exception as e:
             logger.error(f"清理过期文件缓存失败: {e}")
             return 0
+    
+    def _load_expiry_heap(self) -> None:
+        """扫描缓存目录一次，将带过期时间的缓存项加入过期堆（调用方须持有 _expiry_lock）"""
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.cache'):
+                    continue
+                try:
+                    with open(entry.path, 'rb') as f:
+                        header = self._read_header(f)
+                except OSError:
+                    continue
+                if header is not None and header[1]:
+                    self._expiry_heap.append((header[1], entry.name[:-len('.cache')]))
+        heapq.heapify(self._expiry_heap)
+        self._expiry_loaded = True
 
 
 # 全局文件缓存实例
@@ -391,19 +580,19 @@ _global_file_cache = FileCache()
 
 def cache_set(params: CacheSetParams) -> Dict[str, Any]:
     """设置缓存"""
+    return _cache_set(params.key, params.value, params.ttl, params.category)
+
+
+def _cache_set(key: str, value: Any, ttl: Optional[int], category: Optional[str]) -> Dict[str, Any]:
+    """设置缓存（已校验的参数）"""
     try:
-        success = _global_cache.set(
-            params.key, 
-            params.value, 
-            params.ttl, 
-            params.category
-        )
+        success = _global_cache.set(key, value, ttl, category)
         
         return {
             "success": success,
-            "key": params.key,
-            "category": params.category,
-            "ttl": params.ttl,
+            "key": key,
+            "category": category,
+            "ttl": ttl,
             "message": "缓存设置成功" if success else "缓存设置失败"
         }
         
@@ -414,12 +603,17 @@ def cache_set(params: CacheSetParams) -> Dict[str, Any]:
 
 def cache_get(params: CacheGetParams) -> Dict[str, Any]:
     """获取缓存"""
+    return _cache_get(params.key, params.category)
+
+
+def _cache_get(key: str, category: Optional[str]) -> Dict[str, Any]:
+    """获取缓存（已校验的参数）"""
     try:
-        value = _global_cache.get(params.key, params.category)
+        value = _global_cache.get(key, category)
         
         return {
-            "key": params.key,
-            "category": params.category,
+            "key": key,
+            "category": category,
             "found": value is not None,
             "value": value,
             "message": "缓存命中" if value is not None else "缓存未命中"
@@ -432,13 +626,18 @@ def cache_get(params: CacheGetParams) -> Dict[str, Any]:
 
 def cache_delete(params: CacheDeleteParams) -> Dict[str, Any]:
     """删除缓存"""
+    return _cache_delete(params.key, params.category)
+
+
+def _cache_delete(key: str, category: Optional[str]) -> Dict[str, Any]:
+    """删除缓存（已校验的参数）"""
     try:
-        success = _global_cache.delete(params.key, params.category)
+        success = _global_cache.delete(key, category)
         
         return {
             "success": success,
-            "key": params.key,
-            "category": params.category,
+            "key": key,
+            "category": category,
             "message": "缓存删除成功" if success else "缓存项不存在"
         }
         
@@ -449,12 +648,17 @@ def cache_delete(params: CacheDeleteParams) -> Dict[str, Any]:
 
 def cache_list(params: CacheListParams) -> Dict[str, Any]:
     """列出缓存键"""
+    return _cache_list(params.category, params.pattern)
+
+
+def _cache_list(category: Optional[str], pattern: Optional[str]) -> Dict[str, Any]:
+    """列出缓存键（已校验的参数）"""
     try:
-        keys = _global_cache.list_keys(params.category, params.pattern)
+        keys = _global_cache.list_keys(category, pattern)
         
         return {
-            "category": params.category,
-            "pattern": params.pattern,
+            "category": category,
+            "pattern": pattern,
             "keys": keys,
             "count": len(keys)
         }
@@ -466,11 +670,16 @@ def cache_list(params: CacheListParams) -> Dict[str, Any]:
 
 def cache_stats(params: CacheStatsParams) -> Dict[str, Any]:
     """获取缓存统计"""
+    return _cache_stats(params.category)
+
+
+def _cache_stats(category: Optional[str]) -> Dict[str, Any]:
+    """获取缓存统计（已校验的参数）"""
     try:
-        stats = _global_cache.get_stats(params.category)
+        stats = _global_cache.get_stats(category)
         
         return {
-            "category": params.category,
+            "category": category,
             "stats": stats,
             "timestamp": time.time()
         }
@@ -502,11 +711,11 @@ def file_cache_info(params: FileCacheParams) -> Dict[str, Any]:
         file_path = params.file_path
         cache_key = params.cache_key or f"file:{file_path}"
         
-        if not os.path.exists(file_path):
+        # 获取文件信息（一次 stat 同时判断文件是否存在）
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
             return {"error": f"文件不存在: {file_path}"}
-        
-        # 获取文件信息
-        file_stat = os.stat(file_path)
         file_mtime = file_stat.st_mtime
         file_size = file_stat.st_size
         
@@ -547,12 +756,12 @@ def file_cache_set(file_path: str, data: Any, ttl: Optional[int] = None) -> Dict
     try:
         cache_key = f"file:{file_path}"
         
-        if not os.path.exists(file_path):
+        # 获取文件信息（一次 stat 同时判断文件是否存在）
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
             return {"error": f"文件不存在: {file_path}"}
         
-        # 获取文件信息
-        file_stat = os.stat(file_path)
-        
         # 准备缓存数据
         cache_data = {
             "data": data,
@@ -591,11 +800,11 @@ def file_cache_get(file_path: str) -> Dict[str, Any]:
     try:
         cache_key = f"file:{file_path}"
         
-        if not os.path.exists(file_path):
+        # 获取当前文件信息（一次 stat 同时判断文件是否存在）
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
             return {"error": f"文件不存在: {file_path}"}
-        
-        # 获取当前文件信息
-        file_stat = os.stat(file_path)
         current_mtime = file_stat.st_mtime
         
         # 获取缓存数据
@@ -656,38 +865,88 @@ def cleanup_caches() -> Dict[str, Any]:
         return {"error": f"清理缓存失败: {str(e)}"}
 
 
+# MCP 工具参数的轻量校验：热路径上直接从 dict 取值，不构造 pydantic 模型
+def _require_str(params: dict, name: str) -> str:
+    """取必填的字符串参数"""
+    value = params.get(name)
+    if not isinstance(value, str):
+        raise ValueError(f"参数 {name} 必须是字符串")
+    return value
+
+
+def _optional_str(params: dict, name: str, default: Optional[str] = None) -> Optional[str]:
+    """取可选的字符串参数"""
+    value = params.get(name, default)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"参数 {name} 必须是字符串")
+    return value
+
+
+def _category(params: dict) -> str:
+    """取分类参数：缺省为 "default"，显式传入时必须是字符串（不接受 None）"""
+    if "category" not in params:
+        return "default"
+    return _require_str(params, "category")
+
+
+def _optional_ttl(params: dict) -> Optional[int]:
+    """取可选的 TTL 参数：只接受整数（不含 bool）或整数值的浮点数，不做截断"""
+    ttl = params.get("ttl")
+    if ttl is None:
+        return None
+    if isinstance(ttl, bool):
+        raise ValueError("参数 ttl 必须是整数")
+    if isinstance(ttl, int):
+        return ttl
+    if isinstance(ttl, float) and ttl.is_integer():
+        return int(ttl)
+    raise ValueError("参数 ttl 必须是整数")
+
+
+def _coerce_set(params: dict) -> tuple:
+    """校验 cache_set 参数，返回 (key, value, ttl, category)"""
+    if "value" not in params:
+        raise ValueError("缺少参数 value")
+    return (
+        _require_str(params, "key"),
+        params["value"],
+        _optional_ttl(params),
+        _category(params),
+    )
+
+
+def _coerce_key(params: dict) -> tuple:
+    """校验 cache_get/cache_delete 参数，返回 (key, category)"""
+    return _require_str(params, "key"), _category(params)
+
+
 def register_cache_tools(mcp):
     """注册缓存工具到MCP"""
     
     @mcp.tool()
     def cache_set(params: dict):
         """设置缓存数据 - 用于存储应用程序数据，不用于搜索文档内容"""
-        from .cache import cache_set as cache_set_func
-        return cache_set_func(CacheSetParams(**params))
+        return _cache_set(*_coerce_set(params))
     
     @mcp.tool()
     def cache_get(params: dict):
         """获取应用程序缓存数据：用于管理内存中的缓存数据。注意：这不是用于查看文件内容或回答“文件讲了什么”类型的问题。"""
-        from .cache import cache_get as cache_get_func
-        return cache_get_func(CacheGetParams(**params))
+        return _cache_get(*_coerce_key(params))
     
     @mcp.tool()
     def cache_delete(params: dict):
         """删除缓存"""
-        from .cache import cache_delete as cache_delete_func
-        return cache_delete_func(CacheDeleteParams(**params))
+        return _cache_delete(*_coerce_key(params))
     
     @mcp.tool()
     def cache_list(params: dict):
         """列出缓存键"""
-        from .cache import cache_list as cache_list_func
-        return cache_list_func(CacheListParams(**params))
+        return _cache_list(_optional_str(params, "category"), _optional_str(params, "pattern"))
     
     @mcp.tool()
     def cache_stats(params: dict):
         """查看系统缓存统计：获取缓存系统的性能指标和统计信息。注意：这不是用于查看文件内容或回答“文件讲了什么”类型的问题。"""
-        from .cache import cache_stats as cache_stats_func
-        return cache_stats_func(CacheStatsParams(**params))
+        return _cache_stats(_optional_str(params, "category"))
     
     @mcp.tool()
     def cleanup_caches(params: dict = None):
@@ -729,7 +729,7 @@ class DocumentParsingTools:
                     "can_parse": True,
                     "can_extract_metadata": hasattr(parser, 'extract_metadata'),
                     "can_create_chunks": hasattr(parser, 'create_text_chunks'),
-                    "supported_file_types": parser.supported_extensions
+                    "supported_file_types": sorted(parser.supported_extensions)
                 }
             else:
                 result["capabilities"] = {
@@ -166,6 +166,22 @@ class ParseResult:
     conversion_method: Optional[ConversionMethod] = None
 
 
+@dataclass(slots=True)
+class PageInfo:
+    """单个页面的结构化内容"""
+    page_number: int
+    content: str
+    char_count: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可 JSON 序列化的字典"""
+        return {
+            "page_number": self.page_number,
+            "content": self.content,
+            "char_count": self.char_count
+        }
+
+
 @dataclass
 class ConversionResult:
     """文档转换结果"""
@@ -9,6 +9,7 @@ import hashlib
 import tempfile
 import shutil
 import mimetypes
+import multiprocessing
 import time
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -23,6 +24,12 @@ from .exceptions import (
     UnsupportedFileTypeError
 )
 
+# 解析进程池的启动方式：服务器进程带有线程和事件循环，fork 可能复制持有中的锁，
+# 因此优先使用 forkserver（不支持的平台退回 spawn）
+PROCESS_POOL_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
 
 # ============================================================================
 # 文件和路径工具
@@ -651,4 +658,14 @@ def get_mime_type(file_path: str) -> Optional[str]:
         MIME 类型字符串或 None
     """
     mime_type, _ = mimetypes.guess_type(file_path)
-    return mime_type
\ No newline at end of file
+    return mime_type
+
+
+def get_process_pool_context() -> multiprocessing.context.BaseContext:
+    """
+    获取创建解析进程池使用的 multiprocessing 上下文。
+    
+    返回:
+        按 PROCESS_POOL_START_METHOD 启动工作进程的上下文，供 ProcessPoolExecutor 的 mp_context 使用
+    """
+    return multiprocessing.get_context(PROCESS_POOL_START_METHOD)
@@ -0,0 +1,49 @@
+"""
+内存缓存测试
+"""
+
+import time
+import unittest
+
+from mcp_server.tools.cache import MemoryCache, TTL_HEAP_COMPACT_SLACK
+
+
+class MemoryCacheTTLHeapTest(unittest.TestCase):
+    """过期时间堆的大小测试"""
+    
+    def test_overwrite_with_ttl_keeps_heap_bounded(self):
+        """反复以 TTL 覆盖同一个键时，过期时间堆不会无限增长"""
+        cache = MemoryCache(shards=1)
+        for i in range(10000):
+            cache.set("key", i, ttl=60)
+        
+        shard = cache._shards[0]
+        self.assertEqual(len(shard.ttl), 1)
+        self.assertLessEqual(len(shard.ttl_heap), 2 * len(shard.ttl) + TTL_HEAP_COMPACT_SLACK)
+        self.assertEqual(cache.get("key"), 9999)
+    
+    def test_delete_and_evict_keep_heap_bounded(self):
+        """删除和 LRU 淘汰带 TTL 的键后，过期时间堆同样保持有界"""
+        cache = MemoryCache(maxsize=8, shards=1)
+        for i in range(10000):
+            cache.set(f"key{i}", i, ttl=60)
+            if i % 2:
+                cache.delete(f"key{i}")
+        
+        shard = cache._shards[0]
+        self.assertLessEqual(len(shard.ttl_heap), 2 * len(shard.ttl) + TTL_HEAP_COMPACT_SLACK)
+    
+    def test_cleanup_expired_after_compaction(self):
+        """堆重建后 cleanup_expired 仍能清理全部过期项"""
+        cache = MemoryCache(shards=1)
+        for _ in range(100):
+            for i in range(10):
+                cache.set(f"key{i}", i, ttl=0.05)
+        time.sleep(0.1)
+        
+        self.assertEqual(cache.cleanup_expired(), 10)
+        self.assertEqual(len(cache._shards[0].data), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
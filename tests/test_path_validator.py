@@ -0,0 +1,52 @@
+"""
+路径验证器测试
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from mcp_server.security.path_validator import PathValidator, BATCH_SCANDIR_MIN_SIBLINGS
+
+
+class BatchExistenceTest(unittest.TestCase):
+    """批量存在性检查测试"""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.realpath(self._tmp.name)
+        self.validator = PathValidator(allowed_directories=[self.root])
+        self.names = [f"doc{i}.txt" for i in range(BATCH_SCANDIR_MIN_SIBLINGS)]
+        for name in self.names + ["Report.PDF"]:
+            with open(os.path.join(self.root, name), "w") as f:
+                f.write("x")
+    
+    def tearDown(self):
+        self._tmp.cleanup()
+    
+    def test_case_mismatch_falls_back_to_exists(self):
+        """目录列表中按名称匹配不到、但路径实际存在（大小写不同）时仍视为存在"""
+        # 模拟大小写不敏感文件系统：目录列表返回磁盘上的小写名称，调用方传入的是另一种大小写
+        listing = {name: False for name in self.names}
+        listing["report.pdf"] = False
+        paths = [os.path.join(self.root, name) for name in self.names + ["Report.PDF"]]
+        
+        with mock.patch.object(self.validator, "_list_directory", return_value=listing):
+            existing = self.validator._check_batch_existence(paths)
+        
+        self.assertTrue(all(existing.values()))
+    
+    def test_missing_path_still_reported(self):
+        """确实不存在的路径在按目录批量检查时仍报告为不存在"""
+        missing = os.path.join(self.root, "missing.txt")
+        paths = [os.path.join(self.root, name) for name in self.names] + [missing]
+        
+        existing = self.validator._check_batch_existence(paths)
+        
+        self.assertFalse(existing[missing])
+        self.assertEqual(sum(existing.values()), len(self.names))
+
+
+if __name__ == "__main__":
+    unittest.main()